@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import deque
+
+from twilio.twiml.voice_response import VoiceResponse
+
+BUSY = "busy"
+CALLBACK = "callback"
+
+
+def overflow_twiml(mode):
+    """TwiML for calls turned away: a busy signal, or a message asking the caller to try again later."""
+    response = VoiceResponse()
+    if mode == CALLBACK:
+        response.say("All our assistants are busy right now. Please call again in a few minutes.")
+        response.hangup()
+    else:
+        # Not answered, so the call isn't billed
+        response.reject(reason="busy")
+    return str(response)
+
+
+class Admission:
+    """
+    Limits the concurrent calls of this worker to max_calls, 0 for no limit.
+
+    The incoming-call webhook reserves a slot before answering with the
+    <Connect> TwiML, and the media stream takes the reservation when it
+    connects. Reservations the stream never claims expire after
+    reservation_seconds, e.g. when the caller hung up or the stream landed
+    on another worker. When every slot is taken, up to queue_size webhooks
+    wait queue_timeout seconds for one to free up, in arrival order. The
+    rest are turned away. Media streams arriving without a reservation on a
+    full worker are rejected too.
+    """
+
+    def __init__(self, max_calls, queue_size=5, queue_timeout=5.0, reservation_seconds=15.0):
+        self.max_calls = max_calls
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.reservation_seconds = reservation_seconds
+
+        self.active = 0
+        self.reservations = deque()  # expiry times, oldest first
+        self.waiters = deque()
+
+        self.max_active = 0
+        self.admitted = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.rejected = 0
+        self.queue_timeouts = 0
+        self.rejected_streams = 0
+        self.expired_reservations = 0
+
+    def expire(self):
+        now = time.monotonic()
+        while self.reservations and self.reservations[0] <= now:
+            self.reservations.popleft()
+            self.expired_reservations += 1
+
+    def has_room(self):
+        self.expire()
+        return self.max_calls <= 0 or self.active + len(self.reservations) < self.max_calls
+
+    def add_reservation(self):
+        self.reservations.append(time.monotonic() + self.reservation_seconds)
+        # Hand the slot to a waiting call if this reservation is never claimed
+        asyncio.get_running_loop().call_later(self.reservation_seconds, self.wake)
+
+    def wake(self):
+        while self.waiters and self.has_room():
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.add_reservation()
+                waiter.set_result(True)
+
+    async def reserve(self):
+        """Hold a slot for a call about to connect its media stream, False if the call should be turned away."""
+        if not self.waiters and self.has_room():
+            self.add_reservation()
+            self.admitted += 1
+            return True
+        if len(self.waiters) >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.queued += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            self.rejected += 1
+            return False
+        finally:
+            self.wait_total += time.monotonic() - started
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+        self.admitted += 1
+        return True
+
+    def start_call(self):
+        """Admit a media stream, on its reservation when this worker made one, False if it has to be rejected."""
+        self.expire()
+        if self.reservations:
+            self.reservations.popleft()
+        elif not self.has_room():
+            self.rejected_streams += 1
+            return False
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        return True
+
+    def end_call(self):
+        self.active -= 1
+        self.wake()
+
+    def stats(self):
+        self.expire()
+        return {
+            "max_calls": self.max_calls,
+            "active": self.active,
+            "reserved": len(self.reservations),
+            "queued": len(self.waiters),
+            "max_active": self.max_active,
+            "admitted": self.admitted,
+            "queued_total": self.queued,
+            "avg_queue_wait_ms": round(1000 * self.wait_total / self.queued, 1) if self.queued else None,
+            "rejected": self.rejected,
+            "queue_timeouts": self.queue_timeouts,
+            "rejected_streams": self.rejected_streams,
+            "expired_reservations": self.expired_reservations,
+        }
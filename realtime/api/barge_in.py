@@ -0,0 +1,146 @@
+from realtime.codec import dumps, encode_twilio_mark, twilio_mark_prefix, BYTES_PER_MS
+
+# Item id used for the cached greeting, it is seeded as text and can't be truncated
+GREETING_ITEM = "greeting"
+
+
+def audio_ms(payload_base64):
+    """Duration of a base64 μ-law payload in ms."""
+    padding = len(payload_base64) - len(payload_base64.rstrip("="))
+    return (len(payload_base64) * 3 // 4 - padding) / BYTES_PER_MS
+
+
+def truncate_message(item_id, audio_end_ms):
+    return dumps(
+        {"type": "conversation.item.truncate", "item_id": item_id, "content_index": 0, "audio_end_ms": int(audio_end_ms)}
+    )
+
+
+class BargeInStats:
+    def __init__(self):
+        self.interruptions = 0
+        self.responses_cancelled = 0
+        self.discarded_ms = 0.0
+        # Items cut short because the downlink queue was full
+        self.overflow_cuts = 0
+        self.overflow_dropped_ms = 0.0
+
+    def snapshot(self):
+        return {
+            "interruptions": self.interruptions,
+            "responses_cancelled": self.responses_cancelled,
+            "discarded_audio_ms": round(self.discarded_ms),
+            "overflow_cuts": self.overflow_cuts,
+            "overflow_dropped_audio_ms": round(self.overflow_dropped_ms),
+        }
+
+
+barge_in_stats = BargeInStats()
+
+
+class PlaybackTracker:
+    """
+    Tracks how much assistant audio the caller has actually heard.
+
+    Every audio frame sent to Twilio is followed by a mark named after the
+    item and the cumulative ms sent for it. Twilio echoes a mark when playback
+    reaches it, so the last echoed mark is the playback position. When the
+    caller starts speaking while audio is still queued at Twilio, interrupt()
+    returns the messages that stop it: clear for Twilio, and truncate (to the
+    heard position) plus response.cancel for OpenAI.
+
+    When the downlink has no room for a frame, the rest of its item is
+    dropped too, so the caller hears the item end early rather than with
+    gaps, and on_audio_dropped() returns the response.cancel and truncate (to
+    the audio sent) that keep the model's item in line with that.
+    """
+
+    def __init__(self, stats=barge_in_stats):
+        self.stream_sid = None
+        self.item_id = None
+        self.sent_ms = 0.0
+        self.played_ms = 0.0
+        self.response_active = False
+        self.interrupted_items = set()
+        self.cut_items = set()
+        self.stats = stats
+
+    def on_audio_sent(self, item_id, duration_ms):
+        """
+        Account for a frame about to be sent to Twilio, returns the mark message to send after it.
+
+        Returns None for frames of an interrupted item that were already in flight, they are dropped.
+        """
+        if item_id in self.interrupted_items:
+            self.stats.discarded_ms += duration_ms
+            return None
+        if item_id in self.cut_items:
+            self.stats.overflow_dropped_ms += duration_ms
+            return None
+        if item_id != self.item_id:
+            self.item_id = item_id
+            self.sent_ms = 0.0
+            self.played_ms = 0.0
+        self.sent_ms += duration_ms
+        return encode_twilio_mark(self.mark_prefix, f"{item_id}:{self.sent_ms:.0f}")
+
+    def on_audio_dropped(self, item_id, duration_ms):
+        """Account for a frame the downlink had no room for, returns the messages for OpenAI."""
+        if item_id in self.interrupted_items:
+            self.stats.discarded_ms += duration_ms
+            return []
+        self.stats.overflow_dropped_ms += duration_ms
+        if item_id in self.cut_items:
+            return []
+        self.cut_items.add(item_id)
+        self.stats.overflow_cuts += 1
+        to_openai = []
+        if self.response_active:
+            # The rest of the item would be dropped as well
+            to_openai.append(dumps({"type": "response.cancel"}))
+            self.response_active = False
+        # Nothing of an item that hadn't started yet is heard
+        sent_ms = self.sent_ms if item_id == self.item_id else 0.0
+        to_openai.append(truncate_message(item_id, sent_ms))
+        return to_openai
+
+    @property
+    def stream_sid(self):
+        return self._stream_sid
+
+    @stream_sid.setter
+    def stream_sid(self, stream_sid):
+        # Marks follow every audio frame, only their name is formatted per frame
+        self._stream_sid = stream_sid
+        self.mark_prefix = twilio_mark_prefix(stream_sid)
+
+    def on_mark(self, name):
+        item_id, _, played_ms = name.rpartition(":")
+        # Marks of an item we've moved on from are stale
+        if item_id == self.item_id:
+            self.played_ms = max(self.played_ms, float(played_ms))
+
+    def playing(self):
+        return self.item_id is not None and self.sent_ms > self.played_ms
+
+    def interrupt(self):
+        """Return (messages for Twilio, messages for OpenAI) that stop the current playback."""
+        to_twilio = []
+        to_openai = []
+        if self.item_id is not None:
+            self.interrupted_items.add(self.item_id)
+        if self.playing():
+            to_twilio.append(dumps({"event": "clear", "streamSid": self.stream_sid}))
+            if self.item_id != GREETING_ITEM:
+                to_openai.append(truncate_message(self.item_id, self.played_ms))
+            self.stats.interruptions += 1
+            self.stats.discarded_ms += self.sent_ms - self.played_ms
+        if self.response_active:
+            # Stop generating audio nobody will hear
+            to_openai.append(dumps({"type": "response.cancel"}))
+            self.response_active = False
+            self.stats.responses_cancelled += 1
+        self.item_id = None
+        self.sent_ms = 0.0
+        self.played_ms = 0.0
+        return to_twilio, to_openai
@@ -1,17 +1,36 @@
 import os
 import json
-import base64
+import time
 import asyncio
-import websockets
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, Request
 from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.websockets import WebSocketDisconnect
+from fastapi.websockets import WebSocketDisconnect, WebSocketState
 
 from twilio.rest import Client
 from twilio.twiml.voice_response import VoiceResponse, Connect
 
 from prompt import INSTRUCTIONS
+from session_pool import SessionPool
+from greeting import GreetingCache, SEED_USER_ITEM, GREETING_FRAME_BYTES
+from relay_stats import relay_stats
+from call_registry import CallRegistry
+from dialer import Dialer, StubTwilioClient
+from admission import Admission, overflow_twiml, BUSY
+from watchdog import CallWatchdog, watchdog_stats, TWILIO_DISCONNECTED, OPENAI_CLOSED
+from uplink import UplinkBatcher, uplink_stats
+from media_queue import MediaQueue, DROP_OLDEST, DROP_NEWEST
+from barge_in import PlaybackTracker, barge_in_stats, audio_ms, GREETING_ITEM
+from realtime.codec import (
+    loads,
+    peek_audio_delta,
+    peek_twilio_media,
+    extract_string_field,
+    encode_twilio_media,
+    twilio_media_prefix,
+    BYTES_PER_MS,
+)
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -25,6 +44,43 @@ PHONE_NUMBER_FROM = os.getenv('PHONE_NUMBER_FROM')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 DOMAIN = os.getenv('DOMAIN', 'localhost')
 PORT = int(os.getenv('PORT', 8000))
+# Worker processes, each runs its own event loop, session pool and calls
+WORKERS = int(os.getenv('WORKERS', 1))
+# Shared by the workers on this host, maps each streamSid to the worker relaying it
+CALL_REGISTRY_DB = os.getenv('CALL_REGISTRY_DB', 'realtime/data/call_registry.db')
+REGISTRY_HEARTBEAT_SECONDS = 10
+# Outbound dialing, per worker: calls started per second, burst, and Twilio requests in flight
+DIAL_RATE_PER_SECOND = float(os.getenv('DIAL_RATE_PER_SECOND', 1))
+DIAL_BURST = int(os.getenv('DIAL_BURST', 1))
+DIAL_CONCURRENCY = int(os.getenv('DIAL_CONCURRENCY', 4))
+DIAL_MAX_NUMBERS = int(os.getenv('DIAL_MAX_NUMBERS', 1000))
+# Dialing job statuses are kept this long after their last update
+DIAL_JOB_RETENTION_SECONDS = float(os.getenv('DIAL_JOB_RETENTION_SECONDS', 86400))
+# Concurrent calls per worker (0 for no limit), incoming calls beyond it wait in a short queue
+MAX_CONCURRENT_CALLS = int(os.getenv('MAX_CONCURRENT_CALLS', 20))
+CALL_QUEUE_SIZE = int(os.getenv('CALL_QUEUE_SIZE', 5))
+CALL_QUEUE_TIMEOUT_SECONDS = float(os.getenv('CALL_QUEUE_TIMEOUT_SECONDS', 5))
+# What calls turned away get: busy (busy signal) or callback (asked to call again later)
+CALL_OVERFLOW = os.getenv('CALL_OVERFLOW', BUSY)
+# A call ends after this long without audio either way, or after lasting MAX_CALL_SECONDS
+CALL_IDLE_SECONDS = float(os.getenv('CALL_IDLE_SECONDS', 120))
+MAX_CALL_SECONDS = float(os.getenv('MAX_CALL_SECONDS', 1800))
+# Dial through a local stub instead of Twilio's REST API
+TWILIO_STUB = os.getenv('TWILIO_STUB', '').lower() in ('1', 'true', 'yes')
+
+# Point at a local stub for load tests, see realtime/benchmarks/load_test.py
+OPENAI_REALTIME_URL = os.getenv('OPENAI_REALTIME_URL', 'wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview')
+# Sessions kept connected and configured ahead of calls, 0 connects on demand
+SESSION_POOL_SIZE = int(os.getenv('SESSION_POOL_SIZE', 2))
+SESSION_POOL_MAX_IDLE_SECONDS = float(os.getenv('SESSION_POOL_MAX_IDLE_SECONDS', 600))
+# Twilio frames (20ms) coalesced per audio append, smaller while the caller is speaking
+UPLINK_BATCH_MS = int(os.getenv('UPLINK_BATCH_MS', 80))
+UPLINK_SPEECH_BATCH_MS = int(os.getenv('UPLINK_SPEECH_BATCH_MS', 20))
+# Bounded per-call queues: caller audio drops the oldest batch when full, assistant audio the rest of the item
+UPLINK_QUEUE_MAX = int(os.getenv('UPLINK_QUEUE_MAX', 50))
+DOWNLINK_QUEUE_MAX_MS = int(os.getenv('DOWNLINK_QUEUE_MAX_MS', 60000))
+# How far assistant audio is sent ahead of playback, what Twilio buffers and a barge-in discards
+DOWNLINK_LEAD_MS = int(os.getenv('DOWNLINK_LEAD_MS', 300))
 
 VOICE = 'alloy' # alloy, ash, ballad, coral, echo, sage, shimmer and verse
 
@@ -50,50 +106,129 @@ LOG_EVENT_TYPES = [
 
 #     listener.forward(listen)
 
-async def send_initial_conversation_item(openai_ws):
-    """Send initial conversation so AI talks first."""
-    initial_conversation_item = {
-        "type": "conversation.item.create",
-        "item": {
-            "type": "message",
-            "role": "user",
-            "content": [
-                {
-                    "type": "input_text",
-                    "text": "Hi"
-                }
-            ]
-        }
-    }
-    await openai_ws.send(json.dumps(initial_conversation_item))
-    await openai_ws.send(json.dumps({"type": "response.create"}))
+SESSION_CONFIG = {
+    "input_audio_format": "g711_ulaw",
+    "output_audio_format": "g711_ulaw",
+    "turn_detection": {"type": "server_vad"},
+    "voice": VOICE,
+    "instructions": INSTRUCTIONS,
+    "temperature": 0.6,
+}
+
+async def send_initial_conversation_item(openai_ws, greeting=None):
+    """Seed the conversation so AI talks first, response.create is sent once a call claims the session.
+
+    With a cached greeting the model's greeting is seeded too, it continues from there.
+    """
+    items = greeting.seed_items() if greeting else [SEED_USER_ITEM]
+    for item in items:
+        await openai_ws.send(json.dumps(item))
 
 async def initialize_session(openai_ws):
-    """Control initial session with OpenAI."""
+    """Control initial session with OpenAI, returns the cached greeting the conversation was seeded with."""
     session_update = {
         "type": "session.update",
-        "session": {
-            "input_audio_format": "g711_ulaw",
-            "output_audio_format": "g711_ulaw",
-            "turn_detection": {"type": "server_vad"},
-            "voice": VOICE,
-            "instructions": INSTRUCTIONS,
-            "temperature": 0.6,
-        }
+        "session": SESSION_CONFIG
     }
     print('Sending session update:', json.dumps(session_update))
     await openai_ws.send(json.dumps(session_update))
-    await send_initial_conversation_item(openai_ws)
+    greeting = greeting_cache.load()
+    await send_initial_conversation_item(openai_ws, greeting)
+    return greeting
 
 # API
 
-app = FastAPI()
-client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+OPENAI_HEADERS = {
+    "Authorization": f"Bearer {OPENAI_API_KEY}",
+    "OpenAI-Beta": "realtime=v1"
+}
+
+greeting_cache = GreetingCache(OPENAI_REALTIME_URL, OPENAI_HEADERS, SESSION_CONFIG)
+
+session_pool = SessionPool(
+    OPENAI_REALTIME_URL,
+    headers=OPENAI_HEADERS,
+    configure=initialize_session,
+    size=SESSION_POOL_SIZE,
+    max_idle_seconds=SESSION_POOL_MAX_IDLE_SECONDS,
+)
+
+admission = Admission(MAX_CONCURRENT_CALLS, queue_size=CALL_QUEUE_SIZE, queue_timeout=CALL_QUEUE_TIMEOUT_SECONDS)
+OVERFLOW_TWIML = overflow_twiml(CALL_OVERFLOW)
+
+# Queues of the calls in progress, reported at /metrics
+active_calls = {}
+
+# Call transcripts are written here
+os.makedirs("realtime/data", exist_ok=True)
+
+async def warm_up():
+    """Render the greeting if this config has none cached yet, then fill the session pool with it."""
+    try:
+        await greeting_cache.get()
+    except Exception as e:
+        print(f"Greeting not cached, calls will wait for the model to greet: {e!r}")
+    session_pool.start()
+
+call_registry = CallRegistry(CALL_REGISTRY_DB, dial_retention_seconds=DIAL_JOB_RETENTION_SECONDS)
+
+async def registry_heartbeat():
+    while True:
+        await asyncio.sleep(REGISTRY_HEARTBEAT_SECONDS)
+        await asyncio.to_thread(call_registry.heartbeat)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(call_registry.register_worker)
+    heartbeat_task = asyncio.create_task(registry_heartbeat())
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    warm_up_task.cancel()
+    heartbeat_task.cancel()
+    await session_pool.stop()
+    dialer.close()
+    await asyncio.to_thread(call_registry.unregister_worker)
+
+app = FastAPI(lifespan=lifespan)
+client = StubTwilioClient() if TWILIO_STUB else Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+
+OUTBOUND_TWIML = (
+    f'<?xml version="1.0" encoding="UTF-8"?>'
+    f'<Response><Connect><Stream url="wss://{DOMAIN}/media-stream" /></Connect></Response>'
+)
+
+dialer = Dialer(
+    client,
+    PHONE_NUMBER_FROM,
+    OUTBOUND_TWIML,
+    call_registry,
+    rate_per_second=DIAL_RATE_PER_SECOND,
+    burst=DIAL_BURST,
+    concurrency=DIAL_CONCURRENCY,
+)
 
 @app.get('/', response_class=JSONResponse)
 async def index_page():
     return {"message": "Twilio Media Stream Server is running!"}
 
+@app.get('/metrics', response_class=JSONResponse)
+async def metrics():
+    return {
+        "worker": {"pid": os.getpid(), "active_calls": len(active_calls)},
+        "admission": admission.stats(),
+        "workers": await asyncio.to_thread(call_registry.workers),
+        "calls": {
+            call["stream_sid"] or str(call_id): {"uplink": call["uplink"].stats(), "downlink": call["downlink"].stats()}
+            for call_id, call in active_calls.items()
+        },
+        "session_pool": session_pool.stats(),
+        "relay": relay_stats.snapshot(),
+        "uplink": uplink_stats.snapshot(),
+        "barge_in": barge_in_stats.snapshot(),
+        "watchdog": watchdog_stats.snapshot(),
+        "dialer": dialer.stats(),
+    }
+
 @app.api_route("/make-call", methods=["POST"], response_class=JSONResponse)
 async def handle_outbound_call(request: Request):
     """Handle outbound call and return TwiML response to connect to Media Stream."""
@@ -104,23 +239,45 @@ async def handle_outbound_call(request: Request):
     if not phone_number_to_call:
         return {'erro': "Please provide a phone_number_to_call in the request body."}
 
-    outbound_twiml = (
-        f'<?xml version="1.0" encoding="UTF-8"?>'
-        f'<Response><Connect><Stream url="wss://{DOMAIN}/media-stream" /></Connect></Response>'
-    )
-
-    call = client.calls.create(
-        from_=PHONE_NUMBER_FROM,
-        to=phone_number_to_call,
-        twiml=outbound_twiml
-    )
+    # Twilio's client blocks, the dialer runs it off the event loop
+    call = await dialer.call(phone_number_to_call)
 
     return {"message": f"Call to {phone_number_to_call} initiated.", "call_sid": call.sid}
 
+@app.api_route("/make-calls", methods=["POST"], response_class=JSONResponse)
+async def handle_bulk_outbound_calls(request: Request):
+    """Queue outbound calls to a list of numbers, returns a job id to poll for their status."""
+
+    request_json = await request.json()
+    phone_numbers = request_json.get("phone_numbers")
+
+    if not phone_numbers or not isinstance(phone_numbers, list):
+        return JSONResponse({'error': "Please provide a list of phone_numbers in the request body."}, status_code=400)
+    if len(phone_numbers) > DIAL_MAX_NUMBERS:
+        return JSONResponse({'error': f"At most {DIAL_MAX_NUMBERS} phone_numbers per request."}, status_code=400)
+
+    job_id = await dialer.submit([str(phone_number) for phone_number in phone_numbers])
+
+    return JSONResponse(await dialer.job(job_id), status_code=202)
+
+@app.get("/make-calls/{job_id}", response_class=JSONResponse)
+async def bulk_outbound_calls_status(job_id: str):
+    """Status of each number of a /make-calls job."""
+
+    job = await dialer.job(job_id)
+    if job is None:
+        return JSONResponse({'error': f"Unknown job {job_id}."}, status_code=404)
+    return job
+
 @app.api_route("/incoming-call", methods=["GET", "POST"])
 async def handle_incoming_call(request: Request):
     """Handle incoming call and return TwiML response to connect to Media Stream."""
 
+    # Waits up to CALL_QUEUE_TIMEOUT_SECONDS for a slot when the worker is full
+    if not await admission.reserve():
+        print("Over capacity, turning the call away")
+        return HTMLResponse(content=OVERFLOW_TWIML, media_type="application/xml")
+
     response = VoiceResponse()
 
     # <Say> punctuation to improve text-to-speech flow
@@ -144,57 +301,134 @@ async def handle_incoming_call(request: Request):
 @app.websocket('/media-stream')
 async def handle_media_stream(websocket: WebSocket):
     """Handle WebSocket connections between Twilio and OpenAI."""
+    if not admission.start_call():
+        print("Over capacity, rejecting media stream")
+        await websocket.close(code=1013)  # Try again later
+        return
     print("Client connected")
-    await websocket.accept()
-
-    async with websockets.connect(
-        'wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview',
-        additional_headers={
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "OpenAI-Beta": "realtime=v1"
-        }
-    ) as openai_ws:
-        await initialize_session(openai_ws)
+    try:
+        await websocket.accept()
+        # Already connected and configured on a pool hit
+        session = await session_pool.claim()
+    except BaseException:
+        admission.end_call()
+        raise
+    openai_ws = session.websocket
+    greeting = session.setup
+    try:
+        if not greeting:
+            # No cached greeting, the model has to generate it
+            await openai_ws.send(json.dumps({"type": "response.create"}))
         stream_sid = None
-        transcript = []
+        # Both sides carry base64 g711 μ-law, payloads are spliced into this frame as they are
+        media_prefix = twilio_media_prefix(stream_sid)
+        # Readers never send directly, writers drain these so a slow peer only fills a bounded queue
+        uplink_queue = MediaQueue("uplink", UPLINK_QUEUE_MAX, DROP_OLDEST)
+        downlink_queue = MediaQueue("downlink", 0, DROP_NEWEST, max_ms=DOWNLINK_QUEUE_MAX_MS)
+        # Playback position from Twilio marks, to cut the assistant off when the caller talks over it
+        playback = PlaybackTracker()
+        uplink = UplinkBatcher(
+            # Runs from a timer callback, put() never waits
+            lambda message: uplink_queue.put([message], media=True),
+            batch_ms=UPLINK_BATCH_MS,
+            speech_batch_ms=UPLINK_SPEECH_BATCH_MS,
+        )
+        # Ends the call when either side goes away, goes quiet or it runs too long
+        watchdog = CallWatchdog(idle_seconds=CALL_IDLE_SECONDS, max_seconds=MAX_CALL_SECONDS)
+
+        def play_greeting():
+            """Queue the cached greeting, the model already "said" it."""
+            media_messages = list(greeting.media_messages(stream_sid))
+            mark = playback.on_audio_sent(GREETING_ITEM, len(greeting.audio) / BYTES_PER_MS)
+            for index, media_message in enumerate(media_messages):
+                # One mark after the last frame is enough, the greeting is cleared but never truncated
+                messages = [media_message, mark] if index == len(media_messages) - 1 else [media_message]
+                downlink_queue.put(
+                    messages, media=True, duration_ms=GREETING_FRAME_BYTES / BYTES_PER_MS, item_id=GREETING_ITEM
+                )
 
         async def receive_from_twilio():
             """Receive audio data from Twilio and send it to the OpenAI Realtime API."""
             nonlocal stream_sid
-            nonlocal transcript
+            nonlocal media_prefix
 
             try:
                 async for message in websocket.iter_text():
-                    data = json.loads(message)
-                    if data['event'] == 'media':
-                        audio_append = {
-                            "type": "input_audio_buffer.append",
-                            "audio": data['media']['payload']
-                        }
-                        await openai_ws.send(json.dumps(audio_append))
-                    elif data['event'] == 'start':
+                    started = time.thread_time_ns()
+                    payload = peek_twilio_media(message)
+                    if payload is not None:
+                        append = uplink.add(payload)
+                        relay_stats.record("twilio_to_openai", time.thread_time_ns() - started, len(payload))
+                        if append is not None:
+                            uplink_queue.put([append], media=True)
+                        continue
+                    data = loads(message)
+                    if data['event'] == 'start':
                         stream_sid = data['start']['streamSid']
+                        media_prefix = twilio_media_prefix(stream_sid)
+                        playback.stream_sid = stream_sid
+                        active_calls[call_id]["stream_sid"] = stream_sid
+                        await asyncio.to_thread(call_registry.call_started, stream_sid)
                         print(f"Incoming stream has started {stream_sid}")
+                        if greeting:
+                            play_greeting()
+                            with open(f"realtime/data/transcript_{stream_sid}.txt", "a") as transcript_file:
+                                transcript_file.write("\n" + greeting.transcript)
+                    elif data['event'] == 'mark':
+                        playback.on_mark(data['mark']['name'])
             except WebSocketDisconnect:
-                print("Client disconnected.")
-                if openai_ws.open:
-                    await openai_ws.close()
-
-                if stream_sid:
-                        with open(f"realtime/data/transcript_{stream_sid}.txt", "w") as transcript_file:
-                            transcript_file.write("\n".join(transcript))
-                        print(f"Transcript saved to transcript_{stream_sid}.txt")                    
+                pass
+            # Returning ends the call, the watchdog closes OpenAI
+            print("Client disconnected.")
 
         async def send_to_twilio():
             """Receive events from the OpenAI Realtime API, send audio back to Twilio."""
             nonlocal stream_sid
-            nonlocal transcript
 
             try:
                 async for openai_message in openai_ws:
-                    response = json.loads(openai_message)
+                    started = time.thread_time_ns()
+                    delta = peek_audio_delta(openai_message)
+                    if delta is not None:
+                        if delta:
+                            item_id = extract_string_field(openai_message, "item_id")
+                            duration_ms = audio_ms(delta)
+                            if downlink_queue.full():
+                                # Dropped rather than waited for, speech_started and errors behind it are handled now
+                                downlink_queue.reject_media()
+                                to_openai = playback.on_audio_dropped(item_id, duration_ms)
+                                if to_openai:
+                                    uplink_queue.put(to_openai)
+                                continue
+                            mark = playback.on_audio_sent(item_id, duration_ms)
+                            if mark is None:
+                                continue  # Interrupted by the caller or cut short by an earlier drop
+                            watchdog.audio()
+                            media = encode_twilio_media(media_prefix, delta)
+                            relay_stats.record("openai_to_twilio", time.thread_time_ns() - started, len(delta))
+                            downlink_queue.put([media, mark], media=True, duration_ms=duration_ms, item_id=item_id)
+                        continue
+                    response = loads(openai_message)
                     if response['type'] in LOG_EVENT_TYPES:
                         print(f"Received event: {response['type']}", response)
+                    if response['type'] == 'response.created':
+                        playback.response_active = True
+                    elif response['type'] == 'response.done':
+                        playback.response_active = False
+                    if response['type'] == 'input_audio_buffer.speech_started':
+                        uplink.set_speech_active(True)
+                        watchdog.set_caller_speaking(True)
+                        # Barge-in: drop what Twilio still has queued, tell the model where it was cut off
+                        to_twilio, to_openai = playback.interrupt()
+                        if to_twilio:
+                            downlink_queue.clear_media()
+                            downlink_queue.put(to_twilio)
+                        if to_openai:
+                            # Control items go out ahead of the caller audio still queued
+                            uplink_queue.put(to_openai)
+                    elif response['type'] == 'input_audio_buffer.speech_stopped':
+                        uplink.set_speech_active(False)
+                        watchdog.set_caller_speaking(False)
                     if response['type'] == 'session.updated':
                         print("Session updated successfully:", response)
                     if response['type'] == 'response.done':
@@ -203,25 +437,67 @@ async def handle_media_stream(websocket: WebSocket):
                                 with open(f"realtime/data/transcript_{stream_sid}.txt", "a") as transcript_file:
                                     transcript_file.write("\n" + response['response']['output'][0]['content'][0]['transcript'])
                         print(f"Transcript saved to transcript_{stream_sid}.txt")                     
-                    if response['type'] == 'response.audio.delta' and response.get('delta'):
-                        try:
-                            audio_payload = base64.b64encode(base64.b64decode(response['delta'])).decode('utf-8')
-                            audio_delta = {
-                                "event": "media",
-                                "streamSid": stream_sid,
-                                "media": {
-                                    "payload": audio_payload
-                                }
-                            }
-                            await websocket.send_json(audio_delta)
-                        except Exception as e:
-                            print(f"Error processing audio data: {e}")
             except Exception as e:
                 print(f"Error in send_to_twilio: {e}")
 
-        await asyncio.gather(receive_from_twilio(), send_to_twilio())
+        async def openai_writer():
+            while True:
+                _, _, _, _, messages = await uplink_queue.get()
+                for message in messages:
+                    await openai_ws.send(message)
+
+        async def twilio_writer():
+            """Send to Twilio at playback rate, at most DOWNLINK_LEAD_MS ahead of what the caller hears."""
+            play_until = time.monotonic()
+            while True:
+                _, media, duration_ms, item_id, messages = await downlink_queue.get()
+                if media:
+                    now = time.monotonic()
+                    play_until = max(play_until, now)
+                    ahead = play_until - now - DOWNLINK_LEAD_MS / 1000
+                    if ahead > 0:
+                        await asyncio.sleep(ahead)
+                    if item_id in playback.interrupted_items:
+                        continue  # Dequeued before the barge-in cleared the queue
+                    play_until += duration_ms / 1000
+                else:
+                    # The only control message to Twilio is clear, it goes out right away and empties Twilio's buffer
+                    play_until = time.monotonic()
+                for message in messages:
+                    await websocket.send_text(message)
+
+        call_id = id(websocket)
+        active_calls[call_id] = {"stream_sid": stream_sid, "uplink": uplink_queue, "downlink": downlink_queue}
+        relay_stats.call_started(call_id)
+        try:
+            # Returns once the first of these stops or a limit is hit, with all of them cancelled
+            reason = await watchdog.run({
+                receive_from_twilio(): TWILIO_DISCONNECTED,
+                send_to_twilio(): OPENAI_CLOSED,
+                openai_writer(): OPENAI_CLOSED,
+                twilio_writer(): TWILIO_DISCONNECTED,
+            })
+            print(f"Call {stream_sid} ended: {reason}")
+        finally:
+            if websocket.client_state == WebSocketState.CONNECTED:
+                # Ended on our side, closing the stream hangs up the call
+                try:
+                    await websocket.close()
+                except Exception as e:
+                    print(f"Error closing Twilio stream: {e}")
+            relay_stats.call_finished(call_id)
+            active_calls.pop(call_id, None)
+            if stream_sid:
+                await asyncio.to_thread(call_registry.call_ended, stream_sid)
+            uplink.close()
+            print(f"Uplink stats for {stream_sid}: {uplink.call_stats.snapshot()}")
+            print(f"Queue stats for {stream_sid}: uplink {uplink_queue.stats()}, downlink {downlink_queue.stats()}")
+    finally:
+        admission.end_call()
+        # Pooled sessions are plain connections, not opened with `async with`
+        await openai_ws.close()
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("call:app", host="localhost", port=PORT, workers=1)            
\ No newline at end of file
+    uvicorn.run("call:app", host="localhost", port=PORT, workers=WORKERS)
@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class CallRegistry:
+    """
+    Records which worker process owns which Twilio streamSid, shared by all workers on the host.
+
+    Also keeps the per-number status of outbound dialing jobs, so any worker
+    can answer for a job another worker is running.
+
+    Backed by a SQLite file in WAL mode, so uvicorn workers started with
+    --workers N see each other's calls. Rows of workers whose process is gone
+    are removed the next time any worker registers or reads the registry. A
+    live worker is never removed, however late its heartbeat: a saturated
+    event loop heartbeats late, the age is reported instead. Methods are
+    blocking, call them with asyncio.to_thread from the event loop.
+    """
+
+    def __init__(self, path, dial_retention_seconds=86400):
+        self.path = path
+        self.dial_retention_seconds = dial_retention_seconds
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS workers (pid INTEGER PRIMARY KEY, started_at REAL, heartbeat_at REAL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS calls (stream_sid TEXT PRIMARY KEY, pid INTEGER, started_at REAL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS dial_numbers (job_id TEXT, position INTEGER, phone_number TEXT, "
+                "status TEXT, call_sid TEXT, error TEXT, updated_at REAL, PRIMARY KEY (job_id, position))"
+            )
+        return self.connection
+
+    def execute(self, sql, params=()):
+        with self.lock:
+            return self.connect().execute(sql, params).fetchall()
+
+    def register_worker(self):
+        now = time.time()
+        self.execute("INSERT OR REPLACE INTO workers VALUES (?, ?, ?)", (self.pid, now, now))
+        # A previous process may have had our pid
+        self.execute("DELETE FROM calls WHERE pid = ?", (self.pid,))
+        self.remove_dead_workers()
+
+    def unregister_worker(self):
+        self.execute("DELETE FROM calls WHERE pid = ?", (self.pid,))
+        self.execute("DELETE FROM workers WHERE pid = ?", (self.pid,))
+
+    def heartbeat(self):
+        # An upsert, the row is back even if it was removed meanwhile
+        now = time.time()
+        self.execute(
+            "INSERT INTO workers VALUES (?, ?, ?) ON CONFLICT (pid) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+            (self.pid, now, now),
+        )
+
+    def remove_dead_workers(self):
+        for (pid,) in self.execute("SELECT pid FROM workers"):
+            if pid != self.pid and not pid_alive(pid):
+                self.execute("DELETE FROM calls WHERE pid = ?", (pid,))
+                self.execute("DELETE FROM workers WHERE pid = ?", (pid,))
+
+    def call_started(self, stream_sid):
+        self.execute("INSERT OR REPLACE INTO calls VALUES (?, ?, ?)", (stream_sid, self.pid, time.time()))
+
+    def call_ended(self, stream_sid):
+        self.execute("DELETE FROM calls WHERE stream_sid = ? AND pid = ?", (stream_sid, self.pid))
+
+    def owner(self, stream_sid):
+        """Pid of the worker relaying stream_sid, None if no worker has it."""
+        rows = self.execute("SELECT pid FROM calls WHERE stream_sid = ?", (stream_sid,))
+        return rows[0][0] if rows else None
+
+    def workers(self):
+        """Active call count per live worker."""
+        self.remove_dead_workers()
+        rows = self.execute(
+            "SELECT workers.pid, workers.started_at, workers.heartbeat_at, COUNT(calls.stream_sid) FROM workers "
+            "LEFT JOIN calls ON calls.pid = workers.pid GROUP BY workers.pid ORDER BY workers.pid"
+        )
+        now = time.time()
+        return [
+            {
+                "pid": pid,
+                "uptime_seconds": round(now - started_at),
+                "heartbeat_age_seconds": round(now - heartbeat_at, 1),
+                "active_calls": active_calls,
+            }
+            for pid, started_at, heartbeat_at, active_calls in rows
+        ]
+
+    def dial_job_created(self, job_id, phone_numbers):
+        now = time.time()
+        with self.lock:
+            connection = self.connect()
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    "INSERT INTO dial_numbers VALUES (?, ?, ?, 'queued', NULL, NULL, ?)",
+                    [(job_id, position, phone_number, now) for position, phone_number in enumerate(phone_numbers)],
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                # The connection is shared, don't leave it inside a transaction
+                connection.execute("ROLLBACK")
+                raise
+        self.prune_dial_jobs()
+
+    def prune_dial_jobs(self):
+        """Remove jobs untouched for longer than dial_retention_seconds."""
+        self.execute(
+            "DELETE FROM dial_numbers WHERE job_id IN "
+            "(SELECT job_id FROM dial_numbers GROUP BY job_id HAVING MAX(updated_at) < ?)",
+            (time.time() - self.dial_retention_seconds,),
+        )
+
+    def dial_status(self, job_id, position, status, call_sid=None, error=None):
+        self.execute(
+            "UPDATE dial_numbers SET status = ?, call_sid = ?, error = ?, updated_at = ? WHERE job_id = ? AND position = ?",
+            (status, call_sid, error, time.time(), job_id, position),
+        )
+
+    def dial_job(self, job_id):
+        """Status of every number of an outbound dialing job, in submission order, None for an unknown job."""
+        rows = self.execute(
+            "SELECT phone_number, status, call_sid, error FROM dial_numbers WHERE job_id = ? ORDER BY position",
+            (job_id,),
+        )
+        if not rows:
+            return None
+        return [
+            {"phone_number": phone_number, "status": status, "call_sid": call_sid, "error": error}
+            for phone_number, status, call_sid, error in rows
+        ]
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,155 @@
+import asyncio
+import functools
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+QUEUED = "queued"
+DIALING = "dialing"
+INITIATED = "initiated"
+FAILED = "failed"
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, up to `burst` at once."""
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Token bucket needs rate > 0 and burst >= 1, got rate={rate} burst={burst}")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    async def acquire(self):
+        """Wait for a token, returns the seconds spent waiting."""
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return now - started
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class StubCalls:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def create(self, from_, to, twiml):
+        # Blocks like the REST call it stands in for
+        time.sleep(self.latency)
+        if not to.startswith("+"):
+            raise ValueError(f"The 'To' number {to} is not a valid phone number.")
+        return SimpleNamespace(sid=f"CA{uuid.uuid4().hex}", to=to, from_=from_)
+
+
+class StubTwilioClient:
+    """Stands in for twilio.rest.Client when testing dialing, numbers not in E.164 fail like they would at Twilio."""
+
+    def __init__(self, latency=0.3):
+        self.calls = StubCalls(latency)
+
+
+class Dialer:
+    """
+    Places outbound Twilio calls without blocking the event loop.
+
+    client.calls.create is a blocking HTTP request, it runs on a thread pool
+    of `concurrency` threads so media streams on this worker keep flowing.
+    Calls start at most `rate_per_second` per second (Twilio queues calls
+    beyond the account's CPS), jobs share the limit and dial their numbers in
+    order. Per-number status is kept in the call registry, so a job can be
+    looked up from any worker.
+    """
+
+    def __init__(self, client, from_number, twiml, registry, rate_per_second=1, burst=1, concurrency=4):
+        self.client = client
+        self.from_number = from_number
+        self.twiml = twiml
+        self.registry = registry
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dialer")
+        self.slots = asyncio.Semaphore(concurrency)
+        self.jobs = set()  # keeps the running job tasks referenced
+
+        self.in_flight = 0
+        self.initiated = 0
+        self.failed = 0
+        self.rate_limited_seconds = 0.0
+
+    async def call(self, phone_number):
+        """Place one call once the rate limit allows it, returns Twilio's call resource."""
+        self.rate_limited_seconds += await self.bucket.acquire()
+        async with self.slots:
+            return await self.create(phone_number)
+
+    async def create(self, phone_number):
+        self.in_flight += 1
+        try:
+            call = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                functools.partial(self.client.calls.create, from_=self.from_number, to=phone_number, twiml=self.twiml),
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.initiated += 1
+        return call
+
+    async def submit(self, phone_numbers):
+        """Queue a job dialing phone_numbers, returns its id right away."""
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.registry.dial_job_created, job_id, phone_numbers)
+        job = asyncio.create_task(self.run(job_id, phone_numbers))
+        self.jobs.add(job)
+        job.add_done_callback(self.jobs.discard)
+        return job_id
+
+    async def run(self, job_id, phone_numbers):
+        dials = []
+        for position, phone_number in enumerate(phone_numbers):
+            self.rate_limited_seconds += await self.bucket.acquire()
+            await self.slots.acquire()
+            dials.append(asyncio.create_task(self.dial(job_id, position, phone_number)))
+        await asyncio.gather(*dials)
+
+    async def dial(self, job_id, position, phone_number):
+        try:
+            await asyncio.to_thread(self.registry.dial_status, job_id, position, DIALING)
+            call = await self.create(phone_number)
+        except Exception as e:
+            await asyncio.to_thread(self.registry.dial_status, job_id, position, FAILED, error=str(e))
+        else:
+            await asyncio.to_thread(self.registry.dial_status, job_id, position, INITIATED, call_sid=call.sid)
+        finally:
+            self.slots.release()
+
+    async def job(self, job_id):
+        numbers = await asyncio.to_thread(self.registry.dial_job, job_id)
+        if numbers is None:
+            return None
+        counts = {}
+        for number in numbers:
+            counts[number["status"]] = counts.get(number["status"], 0) + 1
+        done = counts.get(INITIATED, 0) + counts.get(FAILED, 0)
+        return {"job_id": job_id, "done": done == len(numbers), "counts": counts, "numbers": numbers}
+
+    def stats(self):
+        return {
+            "jobs_running": len(self.jobs),
+            "in_flight": self.in_flight,
+            "initiated": self.initiated,
+            "failed": self.failed,
+            "rate_limited_seconds": round(self.rate_limited_seconds, 1),
+        }
+
+    def close(self):
+        for job in self.jobs:
+            job.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,164 @@
+import asyncio
+import base64
+import fcntl
+import hashlib
+import json
+import os
+import time
+
+import websockets
+
+from realtime.codec import dumps, loads, peek_audio_delta, encode_twilio_media, twilio_media_prefix
+
+# 100ms of 8kHz g711 μ-law per Twilio media message
+GREETING_FRAME_BYTES = 800
+
+# The model greets the caller in response to this message
+SEED_USER_ITEM = {
+    "type": "conversation.item.create",
+    "item": {
+        "type": "message",
+        "role": "user",
+        "content": [{"type": "input_text", "text": "Hi"}],
+    },
+}
+
+
+class Greeting:
+    def __init__(self, audio, transcript):
+        self.audio = audio  # g711 μ-law, 8kHz mono, as Twilio plays it
+        self.transcript = transcript
+
+    def media_messages(self, stream_sid):
+        """Twilio media messages that play the greeting on stream_sid."""
+        prefix = twilio_media_prefix(stream_sid)
+        for start in range(0, len(self.audio), GREETING_FRAME_BYTES):
+            payload = base64.b64encode(self.audio[start:start + GREETING_FRAME_BYTES]).decode('utf-8')
+            yield encode_twilio_media(prefix, payload)
+
+    def seed_items(self):
+        """Conversation items that make the model continue after the greeting instead of producing it."""
+        return [
+            SEED_USER_ITEM,
+            {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": self.transcript}],
+                },
+            },
+        ]
+
+
+class GreetingCache:
+    """
+    Renders the opening greeting once per instructions and voice and keeps it on disk.
+
+    The greeting is what the model says after the seed "Hi" message, rendered
+    on its own session with the call's session config. Audio is stored as raw
+    g711 μ-law next to a JSON file with the transcript, keyed by a hash of the
+    instructions, voice and output format, so changing any of them renders a
+    new greeting. Workers share the cache directory: a file lock lets one of
+    them render while the others wait and load its result.
+    """
+
+    def __init__(self, url, headers, session, cache_dir="realtime/data/greetings", render_timeout=30):
+        self.url = url
+        self.headers = headers
+        self.session = session
+        self.cache_dir = cache_dir
+        self.render_timeout = render_timeout
+        self.greeting = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def key(self):
+        source = json.dumps(
+            [self.session.get("instructions"), self.session.get("voice"), self.session.get("output_audio_format")]
+        )
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+
+    @property
+    def audio_path(self):
+        return os.path.join(self.cache_dir, f"greeting_{self.key}.ulaw")
+
+    @property
+    def transcript_path(self):
+        return os.path.join(self.cache_dir, f"greeting_{self.key}.json")
+
+    @property
+    def lock_path(self):
+        return os.path.join(self.cache_dir, f"greeting_{self.key}.lock")
+
+    def load(self):
+        """Return the cached greeting, None if it hasn't been rendered for this config."""
+        if self.greeting is None and os.path.exists(self.audio_path) and os.path.exists(self.transcript_path):
+            with open(self.audio_path, "rb") as audio_file:
+                audio = audio_file.read()
+            with open(self.transcript_path, "r") as transcript_file:
+                cached = json.load(transcript_file)
+            # Audio and transcript are replaced one after the other, only use them as a pair
+            if cached.get("bytes") == len(audio):
+                self.greeting = Greeting(audio, cached["transcript"])
+        return self.greeting
+
+    def lock_render(self):
+        """Block until no other process renders this greeting, the lock is held until the file is closed."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        lock_file = open(self.lock_path, "a")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    async def get(self):
+        """Return the greeting, rendering and caching it on the first call."""
+        async with self.lock:
+            if self.load() is None:
+                lock_file = await asyncio.to_thread(self.lock_render)
+                try:
+                    # Another worker may have rendered it while we waited for the lock
+                    if self.load() is None:
+                        started = time.perf_counter()
+                        audio, transcript = await asyncio.wait_for(self.render(), self.render_timeout)
+                        self.save(audio, transcript)
+                        self.greeting = Greeting(audio, transcript)
+                        print(f"Greeting rendered in {time.perf_counter() - started:.2f}s: {transcript}")
+                finally:
+                    lock_file.close()
+        return self.greeting
+
+    async def render(self):
+        audio = bytearray()
+        transcript = ""
+        async with websockets.connect(self.url, extra_headers=self.headers) as openai_ws:
+            await openai_ws.send(dumps({"type": "session.update", "session": self.session}))
+            await openai_ws.send(dumps(SEED_USER_ITEM))
+            await openai_ws.send(dumps({"type": "response.create"}))
+            async for message in openai_ws:
+                delta = peek_audio_delta(message)
+                if delta is not None:
+                    audio += base64.b64decode(delta)
+                    continue
+                event = loads(message)
+                if event["type"] == "response.audio_transcript.done":
+                    transcript += event.get("transcript", "")
+                elif event["type"] == "error":
+                    raise RuntimeError(f"Greeting render failed: {event.get('error')}")
+                elif event["type"] == "response.done":
+                    break
+        if not audio or not transcript:
+            raise RuntimeError("Greeting render returned no audio or transcript")
+        return bytes(audio), transcript
+
+    def save(self, audio, transcript):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Written next to the final paths and renamed, a crash never leaves a half greeting.
+        # Temp names are per process, workers never write into each other's files
+        audio_tmp = f"{self.audio_path}.{os.getpid()}.tmp"
+        transcript_tmp = f"{self.transcript_path}.{os.getpid()}.tmp"
+        with open(audio_tmp, "wb") as audio_file:
+            audio_file.write(audio)
+        with open(transcript_tmp, "w") as transcript_file:
+            json.dump({"transcript": transcript, "voice": self.session.get("voice"), "bytes": len(audio)}, transcript_file)
+        os.replace(audio_tmp, self.audio_path)
+        os.replace(transcript_tmp, self.transcript_path)
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import deque
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class MediaQueue:
+    """
+    Bounded queue between a call's reader and writer tasks, one per direction.
+
+    The queue is full at maxsize media items, or max_ms of queued media
+    (0 leaves either unbounded). When full, "drop_oldest" discards the oldest
+    media item (stale caller audio is worth less than fresh audio), and
+    "drop_newest" turns the new item away, for a reader that must keep
+    handling the events behind it. put() never waits. Control items (clear,
+    truncate, response.cancel, ...) are never dropped and jump ahead of
+    queued media.
+
+    Items are (enqueued_at, media, duration_ms, item_id, messages); the writer
+    sends messages in order.
+    """
+
+    def __init__(self, name, maxsize, policy, max_ms=0):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_ms = max_ms
+        self.policy = policy
+        self.control = deque()
+        self.items = deque()  # media only
+        self.media_count = 0
+        self.media_ms = 0.0
+        self.not_empty = asyncio.Event()
+
+        self.max_depth = 0
+        self.dropped = 0
+        self.cleared = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.delivered = 0
+
+    def put(self, messages, media=False, duration_ms=0.0, item_id=None):
+        if media and self.full():
+            if self.policy == DROP_NEWEST:
+                self.reject_media()
+                return
+            if self.policy == DROP_OLDEST:
+                self.drop_oldest_media()
+        item = (time.perf_counter(), media, duration_ms, item_id, messages)
+        if media:
+            self.items.append(item)
+            self.media_count += 1
+            self.media_ms += duration_ms
+        else:
+            self.control.append(item)
+        self.max_depth = max(self.max_depth, self.depth())
+        self.not_empty.set()
+
+    async def get(self):
+        while not self.control and not self.items:
+            self.not_empty.clear()
+            await self.not_empty.wait()
+        if self.control:
+            item = self.control.popleft()
+        else:
+            item = self.items.popleft()
+            self.media_count -= 1
+            self.media_ms -= item[2]
+        lag = time.perf_counter() - item[0]
+        self.delivered += 1
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+        return item
+
+    def depth(self):
+        return len(self.control) + len(self.items)
+
+    def full(self):
+        return bool(
+            (self.maxsize and self.media_count >= self.maxsize) or (self.max_ms and self.media_ms >= self.max_ms)
+        )
+
+    def reject_media(self):
+        """Count a media item turned away because the queue was full."""
+        self.dropped += 1
+
+    def drop_oldest_media(self):
+        if self.items:
+            item = self.items.popleft()
+            self.media_count -= 1
+            self.media_ms -= item[2]
+            self.dropped += 1
+
+    def clear_media(self):
+        """Drop every queued media item, e.g. on barge-in, control items stay."""
+        self.cleared += len(self.items)
+        self.items.clear()
+        self.media_count = 0
+        self.media_ms = 0.0
+
+    def stats(self):
+        return {
+            "depth": self.depth(),
+            "queued_ms": round(self.media_ms),
+            "max_depth": self.max_depth,
+            "policy": self.policy,
+            "dropped": self.dropped,
+            "cleared": self.cleared,
+            "avg_lag_ms": round(1000 * self.lag_total / self.delivered, 1) if self.delivered else None,
+            "max_lag_ms": round(1000 * self.lag_max, 1),
+        }
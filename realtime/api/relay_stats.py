@@ -0,0 +1,68 @@
+import time
+
+
+class RelayStats:
+    """
+    CPU cost of relaying media frames between Twilio and OpenAI, for all calls of this worker.
+
+    Per-frame costs are thread CPU time of the relay code itself (parse,
+    splice), without the WebSocket send. The process CPU time over the summed
+    call time gives the full cost of a call, including WebSocket framing and
+    everything else the worker does, and from it an estimate of how many
+    concurrent calls one worker can carry.
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.process_cpu_at_start = time.process_time()
+        self.directions = {}
+        self.active_calls = 0
+        self.finished_call_seconds = 0.0
+        self.call_starts = {}
+
+    def record(self, direction, cpu_ns, payload_bytes):
+        stats = self.directions.get(direction)
+        if stats is None:
+            stats = self.directions[direction] = {"frames": 0, "bytes": 0, "cpu_ns": 0, "max_cpu_ns": 0}
+        stats["frames"] += 1
+        stats["bytes"] += payload_bytes
+        stats["cpu_ns"] += cpu_ns
+        if cpu_ns > stats["max_cpu_ns"]:
+            stats["max_cpu_ns"] = cpu_ns
+
+    def call_started(self, call_id):
+        self.active_calls += 1
+        self.call_starts[call_id] = time.monotonic()
+
+    def call_finished(self, call_id):
+        started_at = self.call_starts.pop(call_id, None)
+        if started_at is not None:
+            self.active_calls -= 1
+            self.finished_call_seconds += time.monotonic() - started_at
+
+    def call_seconds(self):
+        now = time.monotonic()
+        return self.finished_call_seconds + sum(now - started_at for started_at in self.call_starts.values())
+
+    def snapshot(self):
+        directions = {}
+        for direction, stats in self.directions.items():
+            directions[direction] = {
+                "frames": stats["frames"],
+                "bytes": stats["bytes"],
+                "avg_cpu_us": round(stats["cpu_ns"] / stats["frames"] / 1000, 2),
+                "max_cpu_us": round(stats["max_cpu_ns"] / 1000, 2),
+            }
+        call_seconds = self.call_seconds()
+        process_cpu = time.process_time() - self.process_cpu_at_start
+        return {
+            "directions": directions,
+            "active_calls": self.active_calls,
+            "call_seconds": round(call_seconds, 1),
+            "process_cpu_seconds": round(process_cpu, 3),
+            # Idle time between calls counts against the estimate, so it errs on the low side
+            "estimated_calls_per_worker": round(call_seconds / process_cpu, 1) if call_seconds and process_cpu else None,
+        }
+
+
+relay_stats = RelayStats()
@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import websockets
+
+from realtime.codec import loads
+
+
+class WarmSession:
+    def __init__(self, websocket, connect_time, setup=None):
+        self.websocket = websocket
+        self.setup = setup  # whatever configure returned, e.g. how the conversation was seeded
+        self.created_at = time.monotonic()
+        self.connect_time = connect_time
+
+    def age(self):
+        return time.monotonic() - self.created_at
+
+    def usable(self, max_idle_seconds):
+        return self.websocket.open and self.age() < max_idle_seconds
+
+
+class SessionPool:
+    """
+    Keeps `size` OpenAI realtime sessions connected and configured ahead of calls.
+
+    A warm session has finished the WebSocket handshake, sent its configuration
+    (session.update and any seed items) and received session.updated, so a new
+    call only has to send response.create. Claimed sessions are replaced in the
+    background; sessions idle for longer than max_idle_seconds are closed and
+    replaced so a call never gets one close to the server's session limit.
+    With size 0 every claim connects on demand, like before the pool existed.
+    """
+
+    def __init__(self, url, headers, configure, size=2, max_idle_seconds=600, ready_timeout=10):
+        self.url = url
+        self.headers = headers
+        self.configure = configure  # async callable that sends the session setup on a new socket, its result is kept as setup
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self.ready_timeout = ready_timeout
+
+        self.idle = []
+        self.connecting = 0
+        self.replenish_needed = asyncio.Event()
+        self.task = None
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.connect_failures = 0
+        self.connect_times = []
+
+    async def connect(self):
+        """Open and configure a session, returns once the server confirmed the configuration."""
+        started = time.perf_counter()
+        websocket = await websockets.connect(self.url, extra_headers=self.headers)
+        try:
+            setup = await self.configure(websocket)
+            await asyncio.wait_for(self.wait_session_updated(websocket), self.ready_timeout)
+        except BaseException:
+            await websocket.close()
+            raise
+        connect_time = time.perf_counter() - started
+        self.connect_times = self.connect_times[-99:] + [connect_time]
+        return WarmSession(websocket, connect_time, setup)
+
+    async def wait_session_updated(self, websocket):
+        async for message in websocket:
+            event = loads(message)
+            if event.get("type") == "session.updated":
+                return
+            if event.get("type") == "error":
+                raise RuntimeError(f"Session setup failed: {event.get('error')}")
+
+    async def claim(self):
+        """Return a configured WarmSession, from the pool when one is ready."""
+        while self.idle:
+            session = self.idle.pop(0)
+            if session.usable(self.max_idle_seconds):
+                self.hits += 1
+                self.replenish_needed.set()
+                return session
+            self.expired += 1
+            asyncio.create_task(session.websocket.close())
+        self.misses += 1
+        self.replenish_needed.set()
+        return await self.connect()
+
+    def start(self):
+        if self.task is None and self.size > 0:
+            self.task = asyncio.create_task(self.replenish())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        sessions, self.idle = self.idle, []
+        await asyncio.gather(*(session.websocket.close() for session in sessions), return_exceptions=True)
+
+    async def replenish(self):
+        backoff = 1
+        while True:
+            self.evict_expired()
+            missing = self.size - len(self.idle) - self.connecting
+            if missing > 0:
+                results = await asyncio.gather(
+                    *(self.add_session() for _ in range(missing)), return_exceptions=True
+                )
+                failed = [result for result in results if isinstance(result, Exception)]
+                if failed:
+                    print(f"Session pool: {len(failed)} connect(s) failed: {failed[0]!r}, retrying in {backoff}s")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30)
+                    continue
+                backoff = 1
+            self.replenish_needed.clear()
+            # Wake up on a claim, or in time to replace the oldest idle session
+            try:
+                await asyncio.wait_for(self.replenish_needed.wait(), self.next_expiry())
+            except asyncio.TimeoutError:
+                pass
+
+    async def add_session(self):
+        self.connecting += 1
+        try:
+            session = await self.connect()
+        except Exception:
+            self.connect_failures += 1
+            raise
+        finally:
+            self.connecting -= 1
+        self.idle.append(session)
+
+    def evict_expired(self):
+        for session in [s for s in self.idle if not s.usable(self.max_idle_seconds)]:
+            self.idle.remove(session)
+            self.expired += 1
+            asyncio.create_task(session.websocket.close())
+
+    def next_expiry(self):
+        if not self.idle:
+            return self.max_idle_seconds
+        return max(1, self.max_idle_seconds - max(session.age() for session in self.idle))
+
+    def stats(self):
+        claims = self.hits + self.misses
+        return {
+            "size": self.size,
+            "idle": len(self.idle),
+            "connecting": self.connecting,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / claims, 3) if claims else None,
+            "expired": self.expired,
+            "connect_failures": self.connect_failures,
+            "avg_connect_ms": round(1000 * sum(self.connect_times) / len(self.connect_times), 1)
+            if self.connect_times else None,
+        }
@@ -0,0 +1,116 @@
+import asyncio
+import binascii
+import time
+
+from realtime.codec import encode_audio_append, BYTES_PER_MS
+
+
+class UplinkStats:
+    """Message counts and batching latency of the Twilio -> OpenAI audio uplink."""
+
+    def __init__(self):
+        self.frames = 0
+        self.messages = 0
+        self.timer_flushes = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, frames, latency, timer):
+        self.frames += frames
+        self.messages += 1
+        self.timer_flushes += timer
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def snapshot(self):
+        return {
+            "frames": self.frames,
+            "messages": self.messages,
+            "frames_per_message": round(self.frames / self.messages, 2) if self.messages else None,
+            "timer_flushes": self.timer_flushes,
+            # Time the first frame of a batch waited for the batch to be sent
+            "avg_added_latency_ms": round(1000 * self.latency_total / self.messages, 1) if self.messages else None,
+            "max_added_latency_ms": round(1000 * self.latency_max, 1),
+        }
+
+
+uplink_stats = UplinkStats()
+
+
+class UplinkBatcher:
+    """
+    Coalesces Twilio's 20ms media frames into fewer input_audio_buffer.append messages.
+
+    A batch is sent once it holds batch_ms of audio, or batch_ms after its first
+    frame arrived if Twilio stops sending. While the caller is speaking the
+    threshold drops to speech_batch_ms, so server VAD hears the end of speech
+    without extra delay. Batches of a single frame are forwarded untouched;
+    larger ones are decoded and re-encoded, since 20ms of μ-law (160 bytes)
+    doesn't split into whole base64 groups.
+    """
+
+    def __init__(self, send, batch_ms=80, speech_batch_ms=20, stats=uplink_stats):
+        self.send = send  # callable taking an append message, used for timer flushes, must not block
+        self.batch_ms = batch_ms
+        self.speech_batch_ms = speech_batch_ms
+        self.speech_active = False
+        self.stats = stats
+        self.call_stats = UplinkStats()
+
+        self.frames = []
+        self.batched_bytes = 0
+        self.first_frame_at = None
+        self.timer = None
+
+    @property
+    def threshold_bytes(self):
+        return BYTES_PER_MS * (self.speech_batch_ms if self.speech_active else self.batch_ms)
+
+    def set_speech_active(self, active):
+        self.speech_active = active
+
+    def add(self, payload):
+        """Add a base64 frame, returns an append message when the batch is full."""
+        if not self.frames:
+            self.first_frame_at = time.perf_counter()
+        self.frames.append(payload)
+        # 4 base64 characters per 3 bytes, padding included, close enough for a threshold
+        self.batched_bytes += len(payload) * 3 // 4
+        if self.batched_bytes >= self.threshold_bytes:
+            return self.take()
+        if self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(
+                self.threshold_bytes / BYTES_PER_MS / 1000, self.flush_on_timer
+            )
+        return None
+
+    def take(self, timer=False):
+        """Return the pending frames as one append message, None if there are none."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.frames:
+            return None
+        frames, self.frames = self.frames, []
+        self.batched_bytes = 0
+        if len(frames) == 1:
+            payload = frames[0]
+        else:
+            audio = b"".join(binascii.a2b_base64(frame) for frame in frames)
+            payload = binascii.b2a_base64(audio, newline=False).decode("ascii")
+        latency = time.perf_counter() - self.first_frame_at
+        self.stats.record(len(frames), latency, timer)
+        self.call_stats.record(len(frames), latency, timer)
+        return encode_audio_append(payload)
+
+    def flush_on_timer(self):
+        self.timer = None
+        message = self.take(timer=True)
+        if message is not None:
+            self.send(message)
+
+    def close(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.frames = []
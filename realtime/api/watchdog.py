@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+TWILIO_DISCONNECTED = "twilio_disconnected"
+OPENAI_CLOSED = "openai_closed"
+IDLE_TIMEOUT = "idle_timeout"
+MAX_DURATION = "max_duration"
+ERROR = "error"
+SHUTDOWN = "shutdown"
+
+
+class WatchdogStats:
+    """How the calls of this worker ended, counted per termination reason."""
+
+    def __init__(self):
+        self.terminations = {}
+        self.call_seconds_total = 0.0
+
+    def record(self, reason, call_seconds):
+        self.terminations[reason] = self.terminations.get(reason, 0) + 1
+        self.call_seconds_total += call_seconds
+
+    def snapshot(self):
+        calls = sum(self.terminations.values())
+        return {
+            "terminations": dict(self.terminations),
+            "avg_call_seconds": round(self.call_seconds_total / calls, 1) if calls else None,
+        }
+
+
+watchdog_stats = WatchdogStats()
+
+
+class CallWatchdog:
+    """
+    Supervises the relay tasks of one call and ends the call when any of them stops.
+
+    run() starts every task and returns as soon as the first one finishes,
+    fails, or a limit is hit, after cancelling and awaiting all the others,
+    so nothing of the call outlives it. The call ends when it lasts
+    max_seconds, or after idle_seconds without audio: the assistant isn't
+    speaking and OpenAI hasn't reported caller speech, which also covers a
+    stalled OpenAI session or a Twilio stream that stopped sending.
+    """
+
+    def __init__(self, idle_seconds=120, max_seconds=1800, stats=watchdog_stats):
+        self.idle_seconds = idle_seconds
+        self.max_seconds = max_seconds
+        self.stats = stats
+        self.started_at = time.monotonic()
+        self.last_audio_at = self.started_at
+        self.caller_speaking = False
+        self.reason = None
+
+    def audio(self):
+        """Note audio in either direction, resets the idle timeout."""
+        self.last_audio_at = time.monotonic()
+
+    def set_caller_speaking(self, speaking):
+        self.caller_speaking = speaking
+        self.audio()
+
+    async def limits(self):
+        while True:
+            now = time.monotonic()
+            max_deadline = self.started_at + self.max_seconds
+            if now >= max_deadline:
+                return MAX_DURATION
+            deadline = max_deadline
+            if not self.caller_speaking:
+                idle_deadline = self.last_audio_at + self.idle_seconds
+                if now >= idle_deadline:
+                    return IDLE_TIMEOUT
+                deadline = min(deadline, idle_deadline)
+            # Audio may have moved the idle deadline meanwhile, it is checked again on wake up
+            await asyncio.sleep(deadline - now)
+
+    async def run(self, tasks):
+        """Run {coroutine: reason it ends the call with}, returns the reason the call ended."""
+        reasons = {asyncio.ensure_future(coroutine): reason for coroutine, reason in tasks.items()}
+        limits = asyncio.ensure_future(self.limits())
+        self.reason = SHUTDOWN
+        try:
+            done, _ = await asyncio.wait([limits, *reasons], return_when=asyncio.FIRST_COMPLETED)
+            if limits in done:
+                self.reason = limits.result()
+            else:
+                task = next(iter(done))
+                if task.exception() is not None:
+                    print(f"Call relay failed: {task.exception()!r}")
+                    self.reason = ERROR
+                else:
+                    self.reason = reasons[task]
+        finally:
+            self.stats.record(self.reason, time.monotonic() - self.started_at)
+            pending = [limits, *reasons]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        return self.reason
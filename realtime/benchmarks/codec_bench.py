@@ -0,0 +1,67 @@
+"""
+Microbenchmark for the realtime JSON codec.
+
+Run with `python -m realtime.benchmarks.codec_bench` and compare the numbers
+with and without orjson installed.
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+
+from realtime import codec
+
+
+def sample_audio_delta(audio_ms: int) -> str:
+    # pcm16 at 24kHz, the forge client's output format
+    audio = os.urandom(48 * audio_ms)
+    return json.dumps(
+        {
+            "type": "response.audio.delta",
+            "event_id": "event_AbCdEfGhIjKlMnOpQrStU",
+            "response_id": "resp_AbCdEfGhIjKlMnOpQrStU",
+            "item_id": "item_AbCdEfGhIjKlMnOpQrStU",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": base64.b64encode(audio).decode("utf-8"),
+        },
+        separators=(",", ":"),
+    )
+
+
+def events_per_second(func, message, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(message)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the realtime JSON codec.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--audio-ms", type=int, default=100, help="Audio per event in ms")
+    args = parser.parse_args()
+
+    delta_message = sample_audio_delta(args.audio_ms)
+    audio_base64 = base64.b64encode(os.urandom(48 * args.audio_ms)).decode("utf-8")
+    append_event = {"type": "input_audio_buffer.append", "audio": audio_base64}
+
+    cases = [
+        ("decode audio delta: json.loads", json.loads, delta_message),
+        (f"decode audio delta: codec.loads ({codec.BACKEND})", codec.loads, delta_message),
+        ("decode audio delta: codec.peek_audio_delta", codec.peek_audio_delta, delta_message),
+        ("encode audio append: json.dumps", json.dumps, append_event),
+        (f"encode audio append: codec.dumps ({codec.BACKEND})", codec.dumps, append_event),
+        ("encode audio append: codec.encode_audio_append", codec.encode_audio_append, audio_base64),
+    ]
+
+    print(f"{args.audio_ms}ms of audio per event, {args.iterations} iterations")
+    for name, func, message in cases:
+        rate = events_per_second(func, message, args.iterations)
+        print(f"{name:<55} {rate:>12,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Load test for the Twilio bridge in realtime/api/call.py.
+
+Starts a stub OpenAI realtime server and `call:app` with each requested worker
+count, then opens simulated Twilio media streams against it from several
+client processes. The stub echoes caller audio back as audio deltas, at most
+in real time, so both relay directions are exercised. Throughput is the caller audio that
+reached the stub per wall-clock second, in call-seconds per second. Unpaced
+clients send as fast as the bridge accepts, so this is the capacity of the
+deployment. With --paced they send at Twilio's real rate (20ms frames), and
+the number to watch is the share of audio delivered.
+
+    python -m realtime.benchmarks.load_test --workers 1 2 4 --calls 32
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+API_DIR = os.path.join(REPO_ROOT, "realtime", "api")
+
+# 20ms of 8kHz μ-law, what Twilio sends per media message
+FRAME = base64.b64encode(b"\x7f" * 160).decode("ascii")
+FRAME_BYTES = 160
+BYTES_PER_SECOND = 8000
+
+
+def run_stub_server(port, received_bytes):
+    """Stub OpenAI realtime server, counts appended audio and echoes some of it back."""
+
+    async def handler(websocket, path=None):
+        # Echo no faster than real time, like an assistant speaking, the bridge paces playback anyway
+        connected_at = time.monotonic()
+        echoed_bytes = 0
+        async for message in websocket:
+            event = json.loads(message)
+            if event["type"] == "session.update":
+                await websocket.send(json.dumps({"type": "session.updated"}))
+            elif event["type"] == "response.create":
+                # Enough for the bridge to render and cache a greeting
+                await websocket.send(json.dumps({"type": "response.audio.delta", "item_id": "item_greeting", "delta": FRAME}))
+                await websocket.send(json.dumps({"type": "response.audio_transcript.done", "transcript": "Hello."}))
+                await websocket.send(json.dumps({"type": "response.done", "response": {"output": []}}))
+            elif event["type"] == "input_audio_buffer.append":
+                audio_bytes = len(base64.b64decode(event["audio"]))
+                with received_bytes.get_lock():
+                    received_bytes.value += audio_bytes
+                if echoed_bytes < (time.monotonic() - connected_at) * BYTES_PER_SECOND:
+                    echoed_bytes += audio_bytes
+                    await websocket.send(
+                        json.dumps({"type": "response.audio.delta", "item_id": "item_echo", "delta": event["audio"]})
+                    )
+
+    async def main():
+        async with websockets.serve(handler, "localhost", port, max_size=None):
+            await asyncio.Future()
+
+    asyncio.run(main())
+
+
+async def simulated_call(url, call_index, duration, paced, counts):
+    async with websockets.connect(url, max_size=None) as websocket:
+        stream_sid = f"MZload{os.getpid()}x{call_index}"
+        await websocket.send(json.dumps({"event": "start", "start": {"streamSid": stream_sid}}))
+        media = json.dumps({"event": "media", "media": {"payload": FRAME}, "streamSid": stream_sid})
+
+        async def read():
+            async for message in websocket:
+                if '"event":"media"' in message:
+                    counts["received"] += 1
+
+        reader = asyncio.create_task(read())
+        started = time.monotonic()
+        sent = 0
+        while time.monotonic() - started < duration:
+            await websocket.send(media)
+            sent += 1
+            if paced:
+                # Stay on the 20ms grid instead of accumulating sleep overshoot
+                await asyncio.sleep(max(0, started + sent * 0.02 - time.monotonic()))
+            elif sent % 50 == 0:
+                await asyncio.sleep(0)
+        counts["sent"] += sent
+        reader.cancel()
+
+
+def run_clients(url, calls, duration, paced, results):
+    async def main():
+        counts = {"sent": 0, "received": 0}
+        outcomes = await asyncio.gather(
+            *(simulated_call(url, index, duration, paced, counts) for index in range(calls)), return_exceptions=True
+        )
+        counts["failed"] = sum(1 for outcome in outcomes if isinstance(outcome, Exception))
+        return counts
+
+    results.put(asyncio.run(main()))
+
+
+def wait_until_ready(server, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("call:app did not start")
+
+
+def fetch_active_calls(port):
+    """Active calls per worker from the shared registry, None if the saturated workers don't answer in time."""
+    try:
+        with urllib.request.urlopen(f"http://localhost:{port}/metrics", timeout=15) as response:
+            return [worker["active_calls"] for worker in json.load(response)["workers"]]
+    except OSError:
+        return None
+
+
+def run_once(workers, args, stub_port, received_bytes):
+    # Run from a scratch directory so transcripts, the registry and the stub's greeting stay out of realtime/data
+    workdir = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        PYTHONPATH=REPO_ROOT,
+        OPENAI_REALTIME_URL=f"ws://localhost:{stub_port}",
+        OPENAI_API_KEY="load-test",
+        TWILIO_ACCOUNT_SID="ACload-test",
+        TWILIO_AUTH_TOKEN="load-test",
+        # Measure relay capacity, not admission control: every simulated call gets through
+        MAX_CONCURRENT_CALLS="0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "call:app", "--app-dir", API_DIR, "--port", str(args.port),
+         "--workers", str(workers), "--log-level", "warning", "--timeout-graceful-shutdown", "5"],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(server, args.port)
+        time.sleep(1)  # Let every worker finish its startup
+        received_bytes.value = 0
+
+        url = f"ws://localhost:{args.port}/media-stream"
+        results = multiprocessing.Queue()
+        per_process = [args.calls // args.clients + (index < args.calls % args.clients) for index in range(args.clients)]
+        clients = [
+            multiprocessing.Process(target=run_clients, args=(url, calls, args.duration, args.paced, results))
+            for calls in per_process if calls
+        ]
+        started = time.monotonic()
+        for client in clients:
+            client.start()
+        # Sample mid-run to see how the calls are spread over the workers
+        time.sleep(args.duration / 2)
+        active_calls = fetch_active_calls(args.port)
+        counts = [results.get() for _ in clients]
+        for client in clients:
+            client.join()
+        elapsed = time.monotonic() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    sent = sum(count["sent"] for count in counts)
+    delivered = received_bytes.value / FRAME_BYTES
+    return {
+        "workers": workers,
+        "calls": args.calls,
+        "failed": sum(count["failed"] for count in counts),
+        "call_seconds_per_second": received_bytes.value / BYTES_PER_SECOND / elapsed,
+        "delivered": delivered / sent if sent else 0.0,
+        "echoed_frames": sum(count["received"] for count in counts),
+        "active_calls_per_worker": active_calls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Twilio bridge with a stub OpenAI server.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--calls", type=int, default=32, help="Concurrent simulated calls")
+    parser.add_argument("--clients", type=int, default=4, help="Client processes generating the calls")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of audio per call")
+    parser.add_argument("--paced", action="store_true", help="Send at Twilio's real rate instead of flat out")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stub-port", type=int, default=8766)
+    args = parser.parse_args()
+
+    received_bytes = multiprocessing.Value("q", 0)
+    stub = multiprocessing.Process(target=run_stub_server, args=(args.stub_port, received_bytes), daemon=True)
+    stub.start()
+    try:
+        print(f"{args.calls} calls, {args.duration}s each, {'paced' if args.paced else 'unpaced'}")
+        print(f"{'workers':>7} {'failed':>6} {'call-s/s':>9} {'delivered':>9}  active calls per worker")
+        for workers in args.workers:
+            result = run_once(workers, args, args.stub_port, received_bytes)
+            print(
+                f"{result['workers']:>7} {result['failed']:>6} {result['call_seconds_per_second']:>9.1f} "
+                f"{result['delivered']:>9.1%}  {result['active_calls_per_worker']}"
+            )
+    finally:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
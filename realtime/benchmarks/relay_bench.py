@@ -0,0 +1,120 @@
+"""
+Microbenchmark for the Twilio media relay in realtime/api/call.py.
+
+Compares the previous per-frame work (full JSON parse, base64 decode and
+re-encode, dict serialization) with the zero-copy path (slice the payload,
+splice it into a pre-serialized frame), and estimates how many calls one core
+can relay. WebSocket framing is not included, see /metrics on a running
+worker for the full per-call cost.
+
+Run with `python -m realtime.benchmarks.relay_bench`.
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+
+from realtime import codec
+
+STREAM_SID = "MZ18ad3ab5a668481ce02b83e7395059f0"
+
+
+def twilio_media_message(frame_ms: int) -> str:
+    return json.dumps(
+        {
+            "event": "media",
+            "sequenceNumber": "42",
+            "media": {
+                "track": "inbound",
+                "chunk": "41",
+                "timestamp": "820",
+                "payload": base64.b64encode(os.urandom(codec.BYTES_PER_MS * frame_ms)).decode("utf-8"),
+            },
+            "streamSid": STREAM_SID,
+        },
+        separators=(",", ":"),
+    )
+
+
+def openai_delta_message(frame_ms: int) -> str:
+    return json.dumps(
+        {
+            "type": "response.audio.delta",
+            "event_id": "event_AbCdEfGhIjKlMnOpQrStU",
+            "response_id": "resp_AbCdEfGhIjKlMnOpQrStU",
+            "item_id": "item_AbCdEfGhIjKlMnOpQrStU",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": base64.b64encode(os.urandom(codec.BYTES_PER_MS * frame_ms)).decode("utf-8"),
+        },
+        separators=(",", ":"),
+    )
+
+
+def inbound_previous(message):
+    data = codec.loads(message)
+    if data["event"] == "media":
+        return codec.encode_audio_append(data["media"]["payload"])
+
+
+def inbound_zero_copy(message):
+    payload = codec.peek_twilio_media(message)
+    if payload is not None:
+        return codec.encode_audio_append(payload)
+
+
+def outbound_previous(message):
+    delta = codec.peek_audio_delta(message)
+    payload = base64.b64encode(base64.b64decode(delta)).decode("utf-8")
+    return codec.dumps({"event": "media", "streamSid": STREAM_SID, "media": {"payload": payload}})
+
+
+MEDIA_PREFIX = codec.twilio_media_prefix(STREAM_SID)
+
+
+def outbound_zero_copy(message):
+    delta = codec.peek_audio_delta(message)
+    return codec.encode_twilio_media(MEDIA_PREFIX, delta)
+
+
+def cpu_us_per_frame(func, message, iterations: int) -> float:
+    start = time.thread_time_ns()
+    for _ in range(iterations):
+        func(message)
+    return (time.thread_time_ns() - start) / iterations / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Twilio media relay.")
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--twilio-frame-ms", type=int, default=20, help="Twilio sends 20ms frames")
+    parser.add_argument("--delta-ms", type=int, default=100, help="Audio per response.audio.delta")
+    args = parser.parse_args()
+
+    inbound = twilio_media_message(args.twilio_frame_ms)
+    outbound = openai_delta_message(args.delta_ms)
+    inbound_rate = 1000 / args.twilio_frame_ms  # frames per second of call
+    outbound_rate = 1000 / args.delta_ms
+
+    print(f"codec backend: {codec.BACKEND}, {args.iterations} iterations")
+    results = {}
+    for path, inbound_func, outbound_func in (
+        ("previous", inbound_previous, outbound_previous),
+        ("zero-copy", inbound_zero_copy, outbound_zero_copy),
+    ):
+        inbound_us = cpu_us_per_frame(inbound_func, inbound, args.iterations)
+        outbound_us = cpu_us_per_frame(outbound_func, outbound, args.iterations)
+        # Relay CPU per second of call, both directions at full rate (worst case, both sides talking)
+        call_us = inbound_us * inbound_rate + outbound_us * outbound_rate
+        results[path] = call_us
+        print(
+            f"{path:<10} twilio->openai {inbound_us:6.2f} us/frame, openai->twilio {outbound_us:6.2f} us/frame, "
+            f"{call_us:7.1f} us CPU per call-second, ~{1e6 / call_us:,.0f} calls/core (relay only)"
+        )
+    print(f"zero-copy relay is {results['previous'] / results['zero-copy']:.1f}x cheaper per call")
+
+
+if __name__ == "__main__":
+    main()
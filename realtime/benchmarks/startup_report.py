@@ -0,0 +1,77 @@
+"""
+Import-time report for the forge entry point.
+
+Runs `python -X importtime -c "import realtime.forge.main"` in a fresh
+interpreter and prints the total import time and the slowest modules, so
+regressions in cold start (e.g. a heavy dependency imported at module load
+instead of on first use) show up before they reach a session.
+
+Run with `python -m realtime.benchmarks.startup_report`. The time from start to
+the first "Connected" is logged by forge itself as `startup_to_connected`.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Imported lazily by the tools, they should not appear in the report
+LAZY_MODULES = ("openai", "pandas", "psycopg2", "sqlite3", "requests", "pydantic")
+
+
+def parse_importtime(stderr: str) -> list:
+    """Return (module, depth, self_us, cumulative_us) for each `import time:` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented by two spaces per level below the first
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        rows.append((module.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_import(module: str) -> list:
+    """Import module in a fresh interpreter, return its importtime rows."""
+    env = dict(os.environ)
+    # main.py exits early without these, placeholders are enough to import it
+    env.setdefault("OPENAI_API_KEY", "startup-report")
+    env.setdefault("PERSONALIZATION_FILE", "./config/personalization.json")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time of the forge entry point.")
+    parser.add_argument("--module", default="realtime.forge.main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # Modules the bare interpreter already imports (site, sitecustomize, .pth hooks) aren't ours
+    baseline = {row[0] for row in run_import("")}
+    rows = [row for row in run_import(args.module) if row[0] not in baseline]
+    total_us = sum(row[2] for row in rows)
+    print(f"{args.module}: {len(rows)} modules imported in {total_us / 1000:.1f} ms")
+
+    # Depth 1 are the imports made directly by the entry point's own packages and modules
+    direct = [row for row in rows if row[1] == 1]
+    print("\nSlowest direct imports (cumulative):")
+    for module, _, _, cumulative_us in sorted(direct, key=lambda row: -row[3])[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+    eager = sorted({row[0].split(".")[0] for row in rows} & set(LAZY_MODULES))
+    if eager:
+        print(f"\nImported at startup but expected lazily: {', '.join(eager)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
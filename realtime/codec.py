@@ -0,0 +1,113 @@
+"""
+JSON codec for realtime WebSocket traffic, shared by the forge client and the Twilio bridge.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+Audio events get a fast path: their base64 payloads never contain quotes or
+escapes, so they can be sliced out of (or spliced into) the raw message
+without building a dict. OpenAI and Twilio both carry g711 μ-law as base64
+on a call, so the bridge relays payloads without decoding them.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def dumps(event) -> str:
+        return orjson.dumps(event).decode("utf-8")
+
+    loads = orjson.loads
+else:
+    BACKEND = "json"
+
+    def dumps(event) -> str:
+        return json.dumps(event, separators=(",", ":"))
+
+    loads = json.loads
+
+
+# 8kHz g711 μ-law, one byte per sample
+BYTES_PER_MS = 8
+
+AUDIO_DELTA_TYPE = "response.audio.delta"
+AUDIO_APPEND_TYPE = "input_audio_buffer.append"
+
+# Stand-ins for log_ws_event when the fast path skipped building the real event
+AUDIO_DELTA_EVENT = {"type": AUDIO_DELTA_TYPE}
+AUDIO_APPEND_EVENT = {"type": AUDIO_APPEND_TYPE}
+
+_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_AUDIO_APPEND_SUFFIX = '"}'
+
+TWILIO_MEDIA_EVENT = "media"
+_TWILIO_MEDIA_SUFFIX = '"}}'
+
+
+def extract_string_field(message: str, key: str, start: int = 0):
+    """
+    Return the value of the first "key": "value" pair at or after start, or None.
+
+    Only valid for values without escaped characters (event types, ids, base64).
+    """
+    marker = f'"{key}":'
+    index = message.find(marker, start)
+    if index < 0:
+        return None
+    index += len(marker)
+    length = len(message)
+    while index < length and message[index] == " ":
+        index += 1
+    if index >= length or message[index] != '"':
+        return None
+    end = message.find('"', index + 1)
+    if end < 0:
+        return None
+    return message[index + 1:end]
+
+
+def peek_audio_delta(message):
+    """Return the base64 delta of a response.audio.delta message, or None for any other event."""
+    if not isinstance(message, str):
+        return None
+    # Audio delta events are flat, so the first "type" key is the event type
+    if extract_string_field(message, "type") != AUDIO_DELTA_TYPE:
+        return None
+    return extract_string_field(message, "delta")
+
+
+def encode_audio_append(audio_base64: str) -> str:
+    return _AUDIO_APPEND_PREFIX + audio_base64 + _AUDIO_APPEND_SUFFIX
+
+
+def peek_twilio_media(message):
+    """Return the base64 payload of a Twilio media message, or None for any other event."""
+    if not isinstance(message, str):
+        return None
+    # Twilio puts "event" first and media messages have no other "event" key
+    if extract_string_field(message, "event") != TWILIO_MEDIA_EVENT:
+        return None
+    return extract_string_field(message, "payload")
+
+
+def twilio_media_prefix(stream_sid) -> str:
+    """Serialized start of a Twilio media message for stream_sid, built once per stream."""
+    return '{"event":"media","streamSid":' + json.dumps(stream_sid) + ',"media":{"payload":"'
+
+
+def encode_twilio_media(prefix: str, payload_base64: str) -> str:
+    return prefix + payload_base64 + _TWILIO_MEDIA_SUFFIX
+
+
+def twilio_mark_prefix(stream_sid) -> str:
+    """Serialized start of a Twilio mark message for stream_sid, built once per stream."""
+    return '{"event":"mark","streamSid":' + json.dumps(stream_sid) + ',"mark":{"name":"'
+
+
+def encode_twilio_mark(prefix: str, name: str) -> str:
+    """Only valid for names without characters JSON escapes, e.g. item ids and numbers."""
+    return prefix + name + _TWILIO_MEDIA_SUFFIX
@@ -1,30 +1,46 @@
+import time
+
+# Cold start reference, reported together with the import time once the first session is connected
+STARTUP_STARTED_AT = time.perf_counter()
+
 import asyncio
 import os
 import json
 import websockets
 import base64
-import time
 import argparse
-from datetime import datetime
 from dotenv import load_dotenv
 from websockets.exceptions import ConnectionClosedError
 from .modules.logging import log_tool_call, log_error, log_info, log_warning
+from ..codec import loads, peek_audio_delta, AUDIO_DELTA_EVENT
 
 # Import from modules
 from .modules.async_microphone import AsyncMicrophone
-from .modules.audio import play_audio
+from .modules.audio import AudioPlayer
+from .modules.context_manager import ContextManager
+from .modules.outbound import OutboundQueue
+from .modules.response_scheduler import ResponseScheduler
 from .modules.tools import (
     function_map,
+    tool_timeouts,
     tools,
 )
+from .modules.tool_runtime import ToolRuntime
+from .modules.turn_timeline import TurnTimeline
 from .modules.utils import (
-    RUN_TIME_TABLE_LOG_JSON,
+    metrics_sink,
     SESSION_INSTRUCTIONS,
     PREFIX_PADDING_MS,
     SILENCE_THRESHOLD,
     SILENCE_DURATION_MS,
+    PLAYBACK_MODE,
+    PLAYBACK_MODES,
+    UPLINK_FRAME_MS,
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_PRUNE_MODE,
+    CONTEXT_PRUNE_MODES,
 )
-from .modules.logging import logger, log_ws_event
+from .modules.logging import logger, log_ws_event, flush_ws_event_counts
 import sys
 
 # Load environment variables
@@ -38,9 +54,7 @@ if missing_vars:
     logger.error("Please set these variables in your .env file.")
     sys.exit(1)
 
-# Load personalization data
-with open(os.getenv("PERSONALIZATION_FILE"), "r") as f:
-    personalization = json.load(f)
+IMPORTS_FINISHED_AT = time.perf_counter()
 
 
 def base64_encode_audio(audio_bytes):
@@ -48,36 +62,57 @@ def base64_encode_audio(audio_bytes):
 
 
 def log_runtime(function_or_name: str, duration: float):
-    jsonl_file = RUN_TIME_TABLE_LOG_JSON
-    time_record = {
-        "timestamp": datetime.now().isoformat(),
-        "function": function_or_name,
-        "duration": f"{duration:.4f}",
-    }
-    with open(jsonl_file, "a") as file:
-        json.dump(time_record, file)
-        file.write("\n")
-
+    metrics_sink.record(function_or_name, duration)
     logger.info(f"⏰ {function_or_name}() took {duration:.4f} seconds")
 
 
 class ForgeRealtimeAPI:
-    def __init__(self, prompts=None):
+    def __init__(
+        self,
+        prompts=None,
+        playback_mode=PLAYBACK_MODE,
+        uplink_frame_ms=UPLINK_FRAME_MS,
+        context_budget=CONTEXT_TOKEN_BUDGET,
+        context_mode=CONTEXT_PRUNE_MODE,
+    ):
         self.prompts = prompts
+        self.playback_mode = playback_mode
+        self.context_budget = context_budget
+        self.context_mode = context_mode
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             logger.error("Please set the OPENAI_API_KEY in your .env file.")
             sys.exit(1)
         self.exit_event = asyncio.Event()
-        self.mic = AsyncMicrophone()
+        self.mic = AsyncMicrophone(frame_ms=uplink_frame_ms)
+        self.player = AudioPlayer()
+        self.outbound = None
+        self.response_scheduler = None
+        self.context_manager = None
+        self.tool_runtime = ToolRuntime(
+            function_map, timeouts=tool_timeouts, on_record=self.record_tool_span
+        )
+        self.timeline = TurnTimeline(playback_mode)
 
         # Initialize state variables
         self.assistant_reply = ""
         self.audio_chunks = []
         self.response_in_progress = False
-        self.function_call = None
-        self.function_call_args = ""
+        self.function_calls = {}  # call_id -> {"name", "arguments", "response_id"}
+        self.tool_tasks_by_response = {}  # response_id -> tool call tasks
+        self.playback_task = None  # waits for the player to drain after response.done
         self.response_start_time = None
+        self.turn_start_time = None
+        self.first_audio_received = False
+        self.startup_reported = False
+
+    def report_startup(self):
+        """Log import time and cold start to the first connected session, see benchmarks/startup_report.py."""
+        if self.startup_reported:
+            return
+        self.startup_reported = True
+        log_runtime("startup_imports", IMPORTS_FINISHED_AT - STARTUP_STARTED_AT)
+        log_runtime("startup_to_connected", time.perf_counter() - STARTUP_STARTED_AT)
 
     async def run(self):
         while True:
@@ -96,6 +131,19 @@ class ForgeRealtimeAPI:
                     ping_timeout=10,
                 ) as websocket:
                     log_info("✅ Connected to the server.", style="bold green")
+                    self.report_startup()
+                    log_info(f"🔈 Playback mode: {self.playback_mode}")
+
+                    self.exit_event.clear()
+                    self.player.start()
+                    self.mic.attach_loop(asyncio.get_running_loop())
+                    self.outbound = OutboundQueue(websocket)
+                    self.outbound.start()
+                    self.response_scheduler = ResponseScheduler(self.outbound)
+                    # Item ids are per session, start tracking afresh on every connection
+                    self.context_manager = ContextManager(
+                        self.outbound, token_budget=self.context_budget, mode=self.context_mode
+                    )
 
                     await self.initialize_session(websocket)
                     ws_task = asyncio.create_task(self.process_ws_messages(websocket))
@@ -135,8 +183,25 @@ class ForgeRealtimeAPI:
                 logger.exception(f"An unexpected error occurred: {e}")
                 break  # Exit the loop on unexpected exceptions
             finally:
+                self.cancel_playback_task()
                 self.mic.stop_recording()
                 self.mic.close()
+                self.player.close()
+                await self.tool_runtime.cancel_all()
+                if self.outbound:
+                    await self.outbound.close()
+                    log_info(f"📤 Outbound queue metrics: {self.outbound.metrics()}")
+                if self.response_scheduler:
+                    log_info(f"📅 Response scheduler stats: {self.response_scheduler.stats()}")
+                if self.context_manager:
+                    log_info(f"🧠 Context manager stats: {self.context_manager.stats()}")
+                flush_ws_event_counts()
+                self.timeline.finish_turn()
+                log_info(f"🧭 Turn latency summary (ms): {self.timeline.summary()}")
+                metrics_sink.flush()
+
+        self.tool_runtime.shutdown()
+        log_info(f"🧰 Tool runtime stats: {self.tool_runtime.stats}")
 
     async def initialize_session(self, websocket):
         session_update = {
@@ -156,29 +221,51 @@ class ForgeRealtimeAPI:
                 "tools": tools,
             },
         }
-        log_ws_event("Outgoing", session_update)
-        await websocket.send(json.dumps(session_update))
+        if self.context_mode == "summarize":
+            # The digest is built from transcripts, the user's side needs input transcription
+            session_update["session"]["input_audio_transcription"] = {"model": "whisper-1"}
+        self.outbound.send(session_update)
 
     async def process_ws_messages(self, websocket):
         while True:
             try:
                 message = await websocket.recv()
-                event = json.loads(message)
+                # Audio deltas are the bulk of the traffic, skip the full parse for them
+                audio_delta = peek_audio_delta(message)
+                if audio_delta is not None:
+                    log_ws_event("Incoming", AUDIO_DELTA_EVENT)
+                    self.handle_audio_delta(audio_delta)
+                    continue
+                event = loads(message)
                 log_ws_event("Incoming", event)
                 await self.handle_event(event, websocket)
-            except websockets.ConnectionClosed:
+            except websockets.ConnectionClosed as e:
                 log_warning("⚠️ WebSocket connection lost.") #my name is
+                # Sends go through the outbound queue and no longer raise, so stop the audio loop here
+                self.exit_event.set()
+                self.mic.wake()
+                if isinstance(e, ConnectionClosedError):
+                    raise
                 break
 
     async def handle_event(self, event, websocket):
         event_type = event.get("type")
         if event_type == "response.created":
+            self.cancel_playback_task()
             self.mic.start_receiving()
             self.response_in_progress = True
+            self.response_scheduler.on_response_created(event.get("response", {}).get("id"))
+            self.timeline.mark("response_created")
+            self.player.reset_timing()
+            # Measure from the end of the user's speech when we have it, otherwise from response.created
+            self.turn_start_time = self.response_start_time or time.perf_counter()
+            self.first_audio_received = False
         elif event_type == "response.output_item.added":
             await self.handle_output_item_added(event)
         elif event_type == "response.function_call_arguments.delta":
-            self.function_call_args += event.get("delta", "")
+            function_call = self.function_calls.get(event.get("call_id"))
+            if function_call is not None:
+                function_call["arguments"] += event.get("delta", "")
         elif event_type == "response.function_call_arguments.done":
             await self.handle_function_call(event, websocket)
         elif event_type == "response.text.delta":
@@ -186,49 +273,96 @@ class ForgeRealtimeAPI:
             self.assistant_reply += delta
             print(f"Assistant: {delta}", end="", flush=True)
         elif event_type == "response.audio.delta":
-            self.audio_chunks.append(base64.b64decode(event["delta"]))
+            self.handle_audio_delta(event["delta"])
         elif event_type == "response.done":
             await self.handle_response_done(event)
         elif event_type == "error":
             await self.handle_error(event, websocket)
         elif event_type == "input_audio_buffer.speech_started":
             logger.info("Speech detected, listening...")
+            self.timeline.start_turn()
+            self.timeline.mark("speech_started")
         elif event_type == "input_audio_buffer.speech_stopped":
             await self.handle_speech_stopped(websocket)
         elif event_type == "rate_limits.updated":
             self.response_in_progress = False
             self.mic.is_recording = True
             logger.info("Resumed recording after rate_limits.updated")
+        elif event_type == "conversation.item.created":
+            self.context_manager.on_item_created(event)
+        elif event_type == "conversation.item.deleted":
+            self.context_manager.on_item_deleted(event)
+        elif event_type == "conversation.item.input_audio_transcription.completed":
+            self.context_manager.on_input_transcript(event)
         elif event_type == "session.created":
             logger.info(f"Session created. Default instructions: {event.get('instructions')}")
 
+    def handle_audio_delta(self, delta):
+        self.timeline.mark("first_audio_delta")
+        audio_chunk = base64.b64decode(delta)
+        if self.playback_mode == "streaming":
+            self.log_time_to_first_audio()
+            self.player.write(audio_chunk)
+        else:
+            self.audio_chunks.append(audio_chunk)
+
+    def log_time_to_first_audio(self):
+        if self.first_audio_received or self.turn_start_time is None:
+            return
+        self.first_audio_received = True
+        log_runtime(
+            f"time_to_first_audio_{self.playback_mode}",
+            time.perf_counter() - self.turn_start_time,
+        )
+
     async def handle_output_item_added(self, event):
         item = event.get("item", {})
         if item.get("type") == "function_call":
-            self.function_call = item
-            self.function_call_args = ""
+            self.function_calls[item.get("call_id")] = {
+                "name": item.get("name"),
+                "arguments": "",
+                "response_id": event.get("response_id"),
+            }
 
     async def handle_function_call(self, event, websocket):
-        if self.function_call:
-            function_name = self.function_call.get("name")
-            call_id = self.function_call.get("call_id")
+        call_id = event.get("call_id")
+        function_call = self.function_calls.pop(call_id, None)
+        if function_call:
+            function_name = function_call["name"]
+            # The done event carries the complete arguments, fall back to the accumulated deltas
+            function_call_args = event.get("arguments") or function_call["arguments"]
             logger.info(
-                f"Function call: {function_name} with args: {self.function_call_args}"
+                f"Function call: {function_name} with args: {function_call_args}"
             )
             try:
-                args = (
-                    json.loads(self.function_call_args)
-                    if self.function_call_args
-                    else {}
-                )
+                args = json.loads(function_call_args) if function_call_args else {}
             except json.JSONDecodeError:
                 args = {}
-            await self.execute_function_call(function_name, call_id, args, websocket)
+            # Calls from the same response run concurrently, the receive loop keeps handling events
+            task = self.tool_runtime.submit(
+                self.execute_function_call(function_name, call_id, args, websocket)
+            )
+            response_id = event.get("response_id") or function_call["response_id"]
+            self.tool_tasks_by_response.setdefault(response_id, []).append(task)
+
+    async def complete_tool_calls(self, tasks):
+        """Ask for one follow-up response once every function output of a response is submitted."""
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.response_scheduler.request()
+
+    def record_tool_span(self, function_name, submitted_at, started_at, finished_at, outcome):
+        self.timeline.add_span(
+            f"tool:{function_name}",
+            submitted_at,
+            finished_at,
+            outcome=outcome,
+            queue_wait_ms=round(1000 * ((started_at or finished_at) - submitted_at), 1),
+        )
 
     async def execute_function_call(self, function_name, call_id, args, websocket):
         if function_name in function_map:
             try:
-                result = await function_map[function_name](**args)
+                result = await self.tool_runtime.run(function_name, args)
                 log_tool_call(function_name, args, result)
             except Exception as e:
                 error_message = f"Error executing function '{function_name}': {str(e)}"
@@ -249,13 +383,7 @@ class ForgeRealtimeAPI:
                 "output": json.dumps(result),
             },
         }
-        log_ws_event("Outgoing", function_call_output)
-        await websocket.send(json.dumps(function_call_output))
-        await websocket.send(json.dumps({"type": "response.create"}))
-
-        # Reset function call state
-        self.function_call = None
-        self.function_call_args = ""
+        self.outbound.send(function_call_output)
 
     async def send_error_message_to_assistant(self, error_message, websocket):
         error_item = {
@@ -266,11 +394,20 @@ class ForgeRealtimeAPI:
                 "content": [{"type": "text", "text": error_message}],
             },
         }
-        log_ws_event("Outgoing", error_item)
-        await websocket.send(json.dumps(error_item))
+        self.outbound.send(error_item)
 
     async def handle_response_done(self, event):
-        log_info(f"🤖🗨️ Assistant response: {event["response"]["output"][0]["content"][0]["transcript"]}")
+        response = event.get("response", {})
+        self.response_scheduler.on_response_done(response.get("id"))
+        self.timeline.mark("response_done")
+        self.context_manager.on_response_done(response)
+        for item in response.get("output", []):
+            for content in item.get("content") or []:
+                if content.get("transcript"):
+                    log_info(f"🤖🗨️ Assistant response: {content['transcript']}")
+        tool_tasks = self.tool_tasks_by_response.pop(response.get("id"), None)
+        if tool_tasks:
+            self.tool_runtime.submit(self.complete_tool_calls(tool_tasks))
         if self.response_start_time is not None:
             response_end_time = time.perf_counter()
             response_duration = response_end_time - self.response_start_time
@@ -279,16 +416,32 @@ class ForgeRealtimeAPI:
         log_info("Assistant response complete.", style="bold blue")
         if self.audio_chunks:
             audio_data = b"".join(self.audio_chunks)
-            logger.info(
-                f"Sending {len(audio_data)} bytes of audio data to play_audio()"
-            )
-            await play_audio(audio_data)
-            logger.info("Finished play_audio()")
+            logger.info(f"Sending {len(audio_data)} bytes of audio data to the player")
+            self.log_time_to_first_audio()
+            self.player.write(audio_data)
         self.assistant_reply = ""
         self.audio_chunks = []
+        # Playback can run seconds past response.done, the receive loop keeps reading meanwhile
+        self.playback_task = asyncio.create_task(self.finish_playback(bool(tool_tasks)))
+
+    async def finish_playback(self, has_tool_calls):
+        await self.player.drain()
+        logger.info("Finished playback")
+        if self.player.first_sample_at is not None:
+            self.timeline.mark("first_playback_sample", self.player.first_sample_at)
+            self.timeline.mark("playback_end", self.player.drained_at)
+        if not has_tool_calls:
+            # A response with tool calls is followed by another response in the same turn
+            self.timeline.finish_turn()
         logger.info("Calling stop_receiving()")
         self.mic.stop_receiving()
 
+    def cancel_playback_task(self):
+        """Stop waiting for the previous response's playback, the next response takes the microphone over."""
+        if self.playback_task is not None and not self.playback_task.done():
+            self.playback_task.cancel()
+        self.playback_task = None
+
     async def handle_error(self, event, websocket):
         error_message = event.get("error", {}).get("message", "")
         log_error(f"Error: {error_message}")
@@ -297,14 +450,21 @@ class ForgeRealtimeAPI:
         elif "Conversation already has an active response" in error_message:
             logger.info("Received 'active response' error, adjusting response flow.")
             self.response_in_progress = True
+            self.response_scheduler.on_active_response_error()
         else:
             logger.error(f"Unhandled error: {error_message}")
+            # A rejected response.create never gets a response.done, don't wait for one
+            self.response_scheduler.on_error(event.get("error", {}).get("event_id"))
 
     async def handle_speech_stopped(self, websocket):
         self.mic.stop_recording()
         logger.info("Speech ended, processing...")
         self.response_start_time = time.perf_counter()
-        await websocket.send(json.dumps({"type": "input_audio_buffer.commit"}))
+        self.timeline.mark("speech_stopped", self.response_start_time)
+        self.outbound.send(
+            {"type": "input_audio_buffer.commit"},
+            on_sent=lambda: self.timeline.mark("commit_sent"),
+        )
 
     async def send_initial_prompts(self, websocket):
         logger.info(f"Sending {len(self.prompts)} prompts: {self.prompts}")
@@ -317,33 +477,26 @@ class ForgeRealtimeAPI:
                 "content": content,
             },
         }
-        log_ws_event("Outgoing", event)
-        await websocket.send(json.dumps(event))
+        self.outbound.send(event)
 
         # Trigger the assistant's response
-        response_create_event = {"type": "response.create"}
-        log_ws_event("Outgoing", response_create_event)
-        await websocket.send(json.dumps(response_create_event))
+        self.response_scheduler.request()
 
     async def send_audio_loop(self, websocket):
         try:
             while not self.exit_event.is_set():
-                await asyncio.sleep(0.1)  # Small delay to accumulate audio data
-                if not self.mic.is_receiving:
-                    audio_data = self.mic.get_audio_data()
-                    if audio_data and len(audio_data) > 0:
-                        base64_audio = base64_encode_audio(audio_data)
-                        if base64_audio:
-                            audio_event = {
-                                "type": "input_audio_buffer.append",
-                                "audio": base64_audio,
-                            }
-                            log_ws_event("Outgoing", audio_event)
-                            await websocket.send(json.dumps(audio_event))
-                        else:
-                            logger.debug("No audio data to send")
+                # Wakes as soon as the microphone callback hands over a frame
+                audio_data = await self.mic.read()
+                if audio_data is None:
+                    continue  # Woken without audio, re-check exit_event
+                if self.mic.is_receiving:
+                    continue  # Drop frames captured while the assistant is responding
+                base64_audio = base64_encode_audio(audio_data)
+                if base64_audio:
+                    # Queued behind any pending control events
+                    self.outbound.send_audio(base64_audio)
                 else:
-                    await asyncio.sleep(0.1)  # Wait while receiving assistant response
+                    logger.debug("No audio data to send")
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received. Closing the connection.")
         finally:
@@ -359,11 +512,42 @@ def main():
         description="Run the realtime API with optional prompts."
     )
     parser.add_argument("--prompts", type=str, help="Prompts separated by |")
+    parser.add_argument(
+        "--playback",
+        type=str,
+        choices=PLAYBACK_MODES,
+        default=PLAYBACK_MODE,
+        help="Play audio deltas as they arrive (streaming) or after response.done (buffered)",
+    )
+    parser.add_argument(
+        "--uplink-frame-ms",
+        type=int,
+        default=UPLINK_FRAME_MS,
+        help="Microphone frame size in ms sent per audio append, e.g. 20, 40 or 100",
+    )
+    parser.add_argument(
+        "--context-budget",
+        type=int,
+        default=CONTEXT_TOKEN_BUDGET,
+        help="Input tokens per response before old conversation items are removed",
+    )
+    parser.add_argument(
+        "--context-mode",
+        choices=CONTEXT_PRUNE_MODES,
+        default=CONTEXT_PRUNE_MODE,
+        help="'delete' drops old items, 'summarize' replaces them with a transcript digest",
+    )
     args = parser.parse_args()
 
     prompts = args.prompts.split("|") if args.prompts else None
 
-    realtime_api_instance = ForgeRealtimeAPI(prompts)
+    realtime_api_instance = ForgeRealtimeAPI(
+        prompts,
+        playback_mode=args.playback,
+        uplink_frame_ms=args.uplink_frame_ms,
+        context_budget=args.context_budget,
+        context_mode=args.context_mode,
+    )
     try:
         asyncio.run(realtime_api_instance.run())
     except KeyboardInterrupt:
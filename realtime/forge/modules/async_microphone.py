@@ -1,27 +1,60 @@
+import asyncio
 import pyaudio
-import queue
 import logging
-from .utils import FORMAT, CHANNELS, RATE, CHUNK
+from .ring_buffer import AudioRingBuffer
+from .utils import (
+    FORMAT,
+    CHANNELS,
+    RATE,
+    SAMPLE_WIDTH,
+    UPLINK_FRAME_MS,
+    MIC_BUFFER_SECONDS,
+    MIC_OVERFLOW_POLICY,
+)
 
 class AsyncMicrophone:
-    def __init__(self):
+    def __init__(
+        self,
+        frame_ms=UPLINK_FRAME_MS,
+        buffer_seconds=MIC_BUFFER_SECONDS,
+        overflow_policy=MIC_OVERFLOW_POLICY,
+    ):
+        self.frame_ms = frame_ms
+        self.frames_per_buffer = int(RATE * frame_ms / 1000)
+        frame_bytes = self.frames_per_buffer * CHANNELS * SAMPLE_WIDTH
+        self.ring = AudioRingBuffer(
+            capacity=int(RATE * buffer_seconds) * CHANNELS * SAMPLE_WIDTH,
+            frame_size=frame_bytes,
+            overflow_policy=overflow_policy,
+        )
+        self.data_ready = asyncio.Event()
         self.p = pyaudio.PyAudio()
         self.stream = self.p.open(
             format=FORMAT,
             channels=CHANNELS,
             rate=RATE,
             input=True,
-            frames_per_buffer=CHUNK,
+            frames_per_buffer=self.frames_per_buffer,
             stream_callback=self.callback,
         )
-        self.queue = queue.Queue()
+        self.loop = None
         self.is_recording = False
         self.is_receiving = False
-        logging.info("AsyncMicrophone initialized")
+        logging.info(f"AsyncMicrophone initialized ({frame_ms}ms frames)")
+
+    def attach_loop(self, loop):
+        """Frames captured before a loop is attached are discarded."""
+        self.loop = loop
 
     def callback(self, in_data, frame_count, time_info, status):
-        if self.is_recording and not self.is_receiving:
-            self.queue.put(in_data)
+        if self.is_recording and not self.is_receiving and self.loop is not None:
+            self.ring.write(in_data)
+            try:
+                # Runs on the PortAudio thread, wake the event loop reader
+                self.loop.call_soon_threadsafe(self.data_ready.set)
+            except RuntimeError:
+                # Event loop already closed during shutdown
+                pass
         return (None, pyaudio.paContinue)
 
     def start_recording(self):
@@ -41,14 +74,23 @@ class AsyncMicrophone:
         self.is_receiving = False
         logging.info("Stopped receiving assistant response")
 
-    def get_audio_data(self):
-        data = b""
-        while not self.queue.empty():
-            data += self.queue.get()
-        return data if data else None
+    async def read(self):
+        """
+        Wait for captured audio and return everything buffered so far as a memoryview.
+        Returns None when woken up by wake() with nothing buffered.
+        """
+        data = self.ring.read()
+        if data is None:
+            self.data_ready.clear()
+            await self.data_ready.wait()
+            data = self.ring.read()
+        return data
+
+    def wake(self):
+        self.data_ready.set()
 
     def close(self):
         self.stream.stop_stream()
         self.stream.close()
         self.p.terminate()
-        logging.info("AsyncMicrophone closed")
+        logging.info(f"AsyncMicrophone closed {self.ring.stats()}")
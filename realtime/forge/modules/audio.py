@@ -1,26 +1,116 @@
 import asyncio
+import threading
+import time
 import pyaudio
 import logging
-from .utils import FORMAT, CHANNELS, RATE
+from .utils import (
+    FORMAT,
+    CHANNELS,
+    RATE,
+    SAMPLE_WIDTH,
+    PLAYER_FRAMES_PER_BUFFER,
+    PLAYER_MAX_BUFFER_SECONDS,
+)
 
 
-async def play_audio(audio_data):
-    p = pyaudio.PyAudio()
-    stream = p.open(format=FORMAT, channels=CHANNELS, rate=RATE, output=True)
-    stream.write(audio_data)
+class AudioPlayer:
+    """
+    Output device opened once per session and fed through a bounded buffer.
 
-    # Add a small delay of silence at the end to prevent popping, and weird cuts off sounds
-    silence_duration = 0.4
-    silence_frames = int(RATE * silence_duration)
-    silence = b"\x00" * (
-        silence_frames * CHANNELS * 2
-    )  # 2 bytes per sample for 16-bit audio
-    stream.write(silence)
+    The PyAudio callback thread pulls samples from the buffer and plays silence
+    when it runs dry, so writes from the event loop never block.
+    """
 
-    # Add a small pause before closing the stream to make sure the audio is fully played
-    await asyncio.sleep(0.5)
+    def __init__(
+        self,
+        frames_per_buffer=PLAYER_FRAMES_PER_BUFFER,
+        max_buffer_seconds=PLAYER_MAX_BUFFER_SECONDS,
+    ):
+        self.frames_per_buffer = frames_per_buffer
+        self.max_buffer_bytes = int(RATE * max_buffer_seconds) * CHANNELS * SAMPLE_WIDTH
+        self.buffer = bytearray()
+        self.lock = threading.Lock()
+        self.p = None
+        self.stream = None
+        self.loop = None
+        self.drained = asyncio.Event()
+        self.drained.set()
+        self.dropped_bytes = 0
+        # perf_counter timestamps of the current utterance, see reset_timing()
+        self.first_sample_at = None
+        self.drained_at = None
+
+    def start(self):
+        if self.stream is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.p = pyaudio.PyAudio()
+        self.stream = self.p.open(
+            format=FORMAT,
+            channels=CHANNELS,
+            rate=RATE,
+            output=True,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self.callback,
+        )
+        self.stream.start_stream()
+        logging.debug("AudioPlayer started")
+
+    def callback(self, in_data, frame_count, time_info, status):
+        needed = frame_count * CHANNELS * SAMPLE_WIDTH
+        with self.lock:
+            had_data = bool(self.buffer)
+            chunk = bytes(self.buffer[:needed])
+            del self.buffer[:needed]
+            is_empty = not self.buffer
+        if had_data and self.first_sample_at is None:
+            self.first_sample_at = time.perf_counter()
+        if len(chunk) < needed:
+            # Keep the device running with silence instead of reopening it per response
+            chunk += b"\x00" * (needed - len(chunk))
+        if had_data and is_empty:
+            self.loop.call_soon_threadsafe(self._mark_drained)
+        return (chunk, pyaudio.paContinue)
+
+    def _mark_drained(self):
+        # A write may have landed between the callback and this call
+        with self.lock:
+            if not self.buffer:
+                self.drained_at = time.perf_counter()
+                self.drained.set()
+
+    def write(self, audio_data):
+        if not audio_data:
+            # Nothing for the callback to play, so nothing would ever set drained again
+            return
+        with self.lock:
+            overflow = len(self.buffer) + len(audio_data) - self.max_buffer_bytes
+            if overflow > 0:
+                # Drop the oldest audio first, then the head of the new chunk if it alone is too large
+                del self.buffer[:overflow]
+                audio_data = audio_data[max(0, len(audio_data) - self.max_buffer_bytes):]
+                self.dropped_bytes += overflow
+            self.buffer += audio_data
+        if overflow > 0:
+            logging.warning(f"AudioPlayer buffer full, dropped {overflow} bytes of audio")
+        self.drained.clear()
+
+    def reset_timing(self):
+        self.first_sample_at = None
+        self.drained_at = None
+
+    async def drain(self):
+        await self.drained.wait()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.p.terminate()
+            self.stream = None
+            self.p = None
+        with self.lock:
+            self.buffer.clear()
+        self.drained.set()
+        logging.debug("AudioPlayer closed")
 
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
-    logging.debug("Audio playback completed")
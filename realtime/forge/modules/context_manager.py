@@ -0,0 +1,182 @@
+import uuid
+from collections import OrderedDict
+
+from .logging import log_info
+from .utils import (
+    CONTEXT_DIGEST_MAX_CHARS,
+    CONTEXT_KEEP_RECENT_ITEMS,
+    CONTEXT_PRUNE_MODE,
+    CONTEXT_TARGET_RATIO,
+    CONTEXT_TOKEN_BUDGET,
+)
+
+# Items that carry confirmed facts (tool arguments and results) and are never pruned
+PINNED_ITEM_TYPES = {"function_call", "function_call_output"}
+
+
+class ContextManager:
+    """
+    Keeps the server-side conversation within a token budget.
+
+    Item ids are tracked from conversation.item.created and the input token
+    count from the usage in response.done. When a response used more than
+    token_budget input tokens, the oldest unpinned items are removed with
+    conversation.item.delete until the estimate is back under
+    target_ratio * token_budget. The session instructions are not items and
+    are never touched, function calls and their outputs are pinned, and the
+    most recent keep_recent items always stay.
+
+    In "summarize" mode the transcripts of the removed items are folded into a
+    single pinned system message (a plain transcript digest, no extra model
+    call), so the assistant keeps the gist of the earlier conversation.
+    """
+
+    def __init__(
+        self,
+        outbound,
+        token_budget=CONTEXT_TOKEN_BUDGET,
+        keep_recent=CONTEXT_KEEP_RECENT_ITEMS,
+        mode=CONTEXT_PRUNE_MODE,
+        target_ratio=CONTEXT_TARGET_RATIO,
+        digest_max_chars=CONTEXT_DIGEST_MAX_CHARS,
+    ):
+        self.outbound = outbound
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.mode = mode
+        self.target_ratio = target_ratio
+        self.digest_max_chars = digest_max_chars
+
+        self.items = OrderedDict()  # item_id -> {"type", "role", "pinned", "transcript"}
+        self.deleting = set()
+        self.digest_item_id = None
+        self.digest_lines = []
+
+        self.last_input_tokens = 0
+        self.max_input_tokens = 0
+        self.prunes = 0
+        self.items_deleted = 0
+
+    def on_item_created(self, event):
+        item = event.get("item", {})
+        item_id = item.get("id")
+        if not item_id or item_id in self.items:
+            return
+        self.items[item_id] = {
+            "type": item.get("type"),
+            "role": item.get("role"),
+            "pinned": item.get("type") in PINNED_ITEM_TYPES
+            or item.get("role") == "system"
+            or item_id == self.digest_item_id,
+            "transcript": item_text(item),
+        }
+
+    def on_item_deleted(self, event):
+        item_id = event.get("item_id")
+        self.items.pop(item_id, None)
+        self.deleting.discard(item_id)
+
+    def on_input_transcript(self, event):
+        item = self.items.get(event.get("item_id"))
+        if item is not None and event.get("transcript"):
+            item["transcript"] = event["transcript"].strip()
+
+    def pin(self, item_id):
+        if item_id in self.items:
+            self.items[item_id]["pinned"] = True
+
+    def on_response_done(self, response):
+        # Output items arrive with empty content in conversation.item.created, keep the final transcripts
+        for output in response.get("output", []):
+            item = self.items.get(output.get("id"))
+            if item is not None and not item["transcript"]:
+                item["transcript"] = item_text(output)
+
+        input_tokens = (response.get("usage") or {}).get("input_tokens")
+        if not input_tokens:
+            return
+        self.last_input_tokens = input_tokens
+        self.max_input_tokens = max(self.max_input_tokens, input_tokens)
+        if input_tokens > self.token_budget:
+            self.prune(input_tokens)
+
+    def prune(self, input_tokens):
+        live = [item_id for item_id in self.items if item_id not in self.deleting]
+        protected = set(live[-self.keep_recent:]) if self.keep_recent else set()
+        candidates = [
+            item_id for item_id in live
+            if not self.items[item_id]["pinned"] and item_id not in protected
+        ]
+        if not candidates:
+            return []
+
+        # Token counts per item are unknown, assume they are spread evenly over the live items
+        excess = input_tokens - self.target_ratio * self.token_budget
+        count = max(1, min(len(candidates), round(len(live) * excess / input_tokens)))
+        victims = candidates[:count]
+
+        if self.mode == "summarize":
+            self.update_digest(victims)
+        for item_id in victims:
+            self.deleting.add(item_id)
+            self.outbound.send({"type": "conversation.item.delete", "item_id": item_id})
+
+        self.prunes += 1
+        self.items_deleted += len(victims)
+        log_info(
+            f"🧹 Context over budget ({input_tokens} > {self.token_budget} input tokens), "
+            f"removing {len(victims)} of {len(live)} items ({self.mode})",
+            style="bold yellow",
+        )
+        return victims
+
+    def update_digest(self, victims):
+        for item_id in victims:
+            item = self.items[item_id]
+            if item["transcript"]:
+                self.digest_lines.append(f"{item['role'] or item['type']}: {item['transcript']}")
+        if not self.digest_lines:
+            return
+
+        text = "Summary of the earlier conversation:\n" + "\n".join(self.digest_lines)
+        if len(text) > self.digest_max_chars:
+            # Keep the newest lines, the oldest ones matter least
+            text = "Summary of the earlier conversation:\n..." + text[-self.digest_max_chars:]
+
+        # Replace the previous digest, ids are ours so the new one can be pinned before it exists
+        if self.digest_item_id is not None:
+            self.deleting.add(self.digest_item_id)
+            self.outbound.send({"type": "conversation.item.delete", "item_id": self.digest_item_id})
+        self.digest_item_id = f"ctx_digest_{uuid.uuid4().hex[:16]}"
+        self.outbound.send(
+            {
+                "type": "conversation.item.create",
+                "previous_item_id": "root",
+                "item": {
+                    "id": self.digest_item_id,
+                    "type": "message",
+                    "role": "system",
+                    "content": [{"type": "input_text", "text": text}],
+                },
+            }
+        )
+
+    def stats(self) -> dict:
+        return {
+            "items": len(self.items),
+            "pinned": sum(1 for item in self.items.values() if item["pinned"]),
+            "last_input_tokens": self.last_input_tokens,
+            "max_input_tokens": self.max_input_tokens,
+            "prunes": self.prunes,
+            "items_deleted": self.items_deleted,
+        }
+
+
+def item_text(item):
+    """Text or transcript of a message item, empty for items without content."""
+    parts = []
+    for content in item.get("content") or []:
+        text = content.get("text") or content.get("transcript")
+        if text:
+            parts.append(text.strip())
+    return " ".join(parts)
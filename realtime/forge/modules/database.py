@@ -1,6 +1,11 @@
-import psycopg2
-import pandas as pd
-import sqlite3
+from typing import TYPE_CHECKING
+
+from .tracing import span
+from .utils import DB_TIMEOUT_SECONDS
+
+# pandas and the database drivers are imported on first use, they dominate forge startup otherwise
+if TYPE_CHECKING:
+    import pandas as pd
 
 class Database:
     def connect(self, url: str):
@@ -9,7 +14,7 @@ class Database:
     def read_tables(self, schema: str = None) -> str:
         raise NotImplementedError("Subclasses must implement this method.")
 
-    def execute_sql(self, sql: str) -> pd.DataFrame:
+    def execute_sql(self, sql: str) -> "pd.DataFrame":
         raise NotImplementedError("Subclasses must implement this method.")
 
     def disconnect(self):
@@ -20,7 +25,14 @@ class PostgresDatabase(Database):
         self.connection = None
 
     def connect(self, url: str):
-        self.connection = psycopg2.connect(url)
+        import psycopg2
+
+        with span("sql.connect", dialect="postgres"):
+            self.connection = psycopg2.connect(
+                url,
+                connect_timeout=DB_TIMEOUT_SECONDS,
+                options=f"-c statement_timeout={DB_TIMEOUT_SECONDS * 1000}",
+            )
 
     def read_tables(self, schema: str = None) -> str:
         cursor = self.connection.cursor()
@@ -73,8 +85,12 @@ class PostgresDatabase(Database):
         cursor.close()
         return table_defs
 
-    def execute_sql(self, sql: str) -> pd.DataFrame:
-        df = pd.read_sql_query(sql, self.connection)
+    def execute_sql(self, sql: str) -> "pd.DataFrame":
+        import pandas as pd
+
+        with span("sql.execute", dialect="postgres", statement=sql[:200]) as sql_span:
+            df = pd.read_sql_query(sql, self.connection)
+            sql_span.set_attribute("row_count", len(df))
         return df
 
     def disconnect(self):
@@ -85,7 +101,10 @@ class SQLiteDatabase(Database):
         self.connection = None
 
     def connect(self, url: str):
-        self.connection = sqlite3.connect(url)
+        import sqlite3
+
+        with span("sql.connect", dialect="sqlite"):
+            self.connection = sqlite3.connect(url, timeout=DB_TIMEOUT_SECONDS)
 
     def read_tables(self, schema: str = None) -> str:
         cursor = self.connection.cursor()
@@ -112,8 +131,11 @@ class SQLiteDatabase(Database):
         cursor.close()
         return table_defs
 
-    def execute_sql(self, sql: str) -> pd.DataFrame:
-        with self.connection:
+    def execute_sql(self, sql: str) -> "pd.DataFrame":
+        import sqlite3
+        import pandas as pd
+
+        with self.connection, span("sql.execute", dialect="sqlite", statement=sql[:200]) as sql_span:
             cursor = self.connection.cursor()
             try:
                 cursor.execute(sql)
@@ -122,9 +144,11 @@ class SQLiteDatabase(Database):
                 # If it's a SELECT query, return the results
                 if sql.strip().lower().startswith("select"):
                     rows = cursor.fetchall()
+                    sql_span.set_attribute("row_count", len(rows))
                     columns = [desc[0] for desc in cursor.description] if cursor.description else []
                     return pd.DataFrame(rows, columns=columns)
                 else:
+                    sql_span.set_attribute("row_count", cursor.rowcount)
                     return pd.DataFrame()  # Return an empty DataFrame for non-SELECT queries
             except sqlite3.OperationalError as e:
                 print(f"SQL Execution Error: {e}")  # Debugging print
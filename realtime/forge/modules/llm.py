@@ -1,20 +1,31 @@
-import openai
 import os
-from pydantic import BaseModel
+from typing import TYPE_CHECKING
+
+from .tracing import span
+from .utils import LLM_TIMEOUT_SECONDS
+
+# The openai client is imported on the first request to keep forge startup fast
+if TYPE_CHECKING:
+    from pydantic import BaseModel
 
 
 def structured_output_prompt(
-        prompt: str, response_format: BaseModel, llm_model: str = "gpt-4o-2024-08-06"
-) -> BaseModel:
-    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    completion = client.beta.chat.completions.parse(
-        model=llm_model,
-        messages=[
-            {"role": "user", "content": prompt},
-        ],
-        response_format=response_format,
-    )
+        prompt: str, response_format: "BaseModel", llm_model: str = "gpt-4o-2024-08-06"
+) -> "BaseModel":
+    import openai
+
+    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=LLM_TIMEOUT_SECONDS, max_retries=0)
+
+    with span("llm.request", model=llm_model, kind="structured_output") as llm_span:
+        completion = client.beta.chat.completions.parse(
+            model=llm_model,
+            messages=[
+                {"role": "user", "content": prompt},
+            ],
+            response_format=response_format,
+        )
+        if completion.usage:
+            llm_span.set_attribute("total_tokens", completion.usage.total_tokens)
 
     message = completion.choices[0].message
 
@@ -25,14 +36,19 @@ def structured_output_prompt(
 
 
 def chat_prompt(prompt: str, model: str) -> str:
-    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    completion = client.beta.chat.completions.parse(
-        model=model,
-        messages=[
-            {"role": "user", "content": prompt},
-        ],
-    )
+    import openai
+
+    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=LLM_TIMEOUT_SECONDS, max_retries=0)
+
+    with span("llm.request", model=model, kind="chat") as llm_span:
+        completion = client.beta.chat.completions.parse(
+            model=model,
+            messages=[
+                {"role": "user", "content": prompt},
+            ],
+        )
+        if completion.usage:
+            llm_span.set_attribute("total_tokens", completion.usage.total_tokens)
 
     message = completion.choices[0].message
 
@@ -1,63 +1,163 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from rich.logging import RichHandler
 from rich.console import Console
 from rich.text import Text
 
 console = Console()
 
+# "rich" renders to the console, "jsonl" writes one JSON object per record to LOG_JSONL_FILE
+LOG_FORMAT = os.getenv("LOG_FORMAT", "rich")
+LOG_JSONL_FILE = os.getenv("LOG_JSONL_FILE", "config/realtime_log.jsonl")
+# High-frequency WebSocket events are counted and summarized once per interval
+LOG_AGGREGATE_SECONDS = float(os.getenv("LOG_AGGREGATE_SECONDS", "1.0"))
+
+EVENT_EMOJIS = {
+    "session.update": "🛠️",
+    "session.created": "🔌",
+    "session.updated": "🔄",
+    "input_audio_buffer.append": "🎤",
+    "input_audio_buffer.commit": "✅",
+    "input_audio_buffer.speech_started": "🗣️",
+    "input_audio_buffer.speech_stopped": "🤫",
+    "input_audio_buffer.cleared": "🧹",
+    "input_audio_buffer.committed": "📨",
+    "conversation.item.create": "📥",
+    "conversation.item.delete": "🗑️",
+    "conversation.item.truncate": "✂️",
+    "conversation.item.created": "📤",
+    "conversation.item.deleted": "🗑️",
+    "conversation.item.truncated": "✂️",
+    "response.create": "➡️",
+    "response.created": "📝",
+    "response.output_item.added": "➕",
+    "response.output_item.done": "✅",
+    "response.text.delta": "✍️",
+    "response.text.done": "📝",
+    "response.audio.delta": "🔊",
+    "response.audio.done": "🔇",
+    "response.done": "✔️",
+    "response.cancel": "⛔",
+    "response.function_call_arguments.delta": "📥",
+    "response.function_call_arguments.done": "📥",
+    "rate_limits.updated": "⏳",
+    "error": "❌",
+    "conversation.item.input_audio_transcription.completed": "📝",
+    "conversation.item.input_audio_transcription.failed": "⚠️",
+}
+
+# Event types aggregated instead of logged one by one, with their label in the summary line
+HIGH_FREQUENCY_EVENTS = {
+    "input_audio_buffer.append": "audio appends",
+    "response.audio.delta": "audio deltas",
+    "response.audio_transcript.delta": "transcript deltas",
+    "response.text.delta": "text deltas",
+    "response.function_call_arguments.delta": "function argument deltas",
+}
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without formatting them first, so Rich
+    styles and tracebacks survive and all formatting happens off the event loop.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage() if isinstance(record.msg, str) else str(record.msg),
+        }
+        for key in ("direction", "event_type", "count", "interval"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
 def setup_logging():
     logger = logging.getLogger("realtime_api")
     logger.setLevel(logging.INFO)
-    handler = RichHandler(rich_tracebacks=True, console=console)
-    formatter = logging.Formatter("%(message)s", datefmt="[%X]")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    if LOG_FORMAT == "jsonl":
+        handler = logging.FileHandler(LOG_JSONL_FILE, encoding="utf-8")
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler = RichHandler(rich_tracebacks=True, console=console)
+        formatter = logging.Formatter("%(message)s", datefmt="[%X]")
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(LocalQueueHandler(log_queue))
     logger.propagate = False
     return logger
 
 logger = setup_logging()
 
+
+class WsEventAggregator:
+    def __init__(self, interval):
+        self.interval = interval
+        self.counts = {}
+        self.window_start = time.monotonic()
+
+    def add(self, direction, event_type):
+        key = (direction, event_type)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        elapsed = now - self.window_start
+        if not force and elapsed < self.interval:
+            return
+        counts, self.counts = self.counts, {}
+        self.window_start = now
+        for (direction, event_type), count in counts.items():
+            emoji = EVENT_EMOJIS.get(event_type, "❓")
+            icon = "⬆️ - Out" if direction == "Outgoing" else "⬇️ - In"
+            style = "cyan" if direction == "Outgoing" else "green"
+            logger.info(
+                Text(f"{emoji} {icon} {count} {HIGH_FREQUENCY_EVENTS[event_type]} in {elapsed:.1f} s", style=style),
+                extra={"direction": direction, "event_type": event_type, "count": count, "interval": round(elapsed, 3)},
+            )
+
+ws_event_aggregator = WsEventAggregator(LOG_AGGREGATE_SECONDS)
+
 # Function to log WebSocket events
 def log_ws_event(direction, event):
     event_type = event.get("type", "Unknown")
-    event_emojis = {
-        "session.update": "🛠️",
-        "session.created": "🔌",
-        "session.updated": "🔄",
-        "input_audio_buffer.append": "🎤",
-        "input_audio_buffer.commit": "✅",
-        "input_audio_buffer.speech_started": "🗣️",
-        "input_audio_buffer.speech_stopped": "🤫",
-        "input_audio_buffer.cleared": "🧹",
-        "input_audio_buffer.committed": "📨",
-        "conversation.item.create": "📥",
-        "conversation.item.delete": "🗑️",
-        "conversation.item.truncate": "✂️",
-        "conversation.item.created": "📤",
-        "conversation.item.deleted": "🗑️",
-        "conversation.item.truncated": "✂️",
-        "response.create": "➡️",
-        "response.created": "📝",
-        "response.output_item.added": "➕",
-        "response.output_item.done": "✅",
-        "response.text.delta": "✍️",
-        "response.text.done": "📝",
-        "response.audio.delta": "🔊",
-        "response.audio.done": "🔇",
-        "response.done": "✔️",
-        "response.cancel": "⛔",
-        "response.function_call_arguments.delta": "📥",
-        "response.function_call_arguments.done": "📥",
-        "rate_limits.updated": "⏳",
-        "error": "❌",
-        "conversation.item.input_audio_transcription.completed": "📝",
-        "conversation.item.input_audio_transcription.failed": "⚠️",
-    }
-    emoji = event_emojis.get(event_type, "❓")
+    if event_type in HIGH_FREQUENCY_EVENTS:
+        ws_event_aggregator.add(direction, event_type)
+        ws_event_aggregator.flush()
+        return
+    ws_event_aggregator.flush()
+    emoji = EVENT_EMOJIS.get(event_type, "❓")
     icon = "⬆️ - Out" if direction == "Outgoing" else "⬇️ - In"
     style = "bold cyan" if direction == "Outgoing" else "bold green"
-    logger.info(Text(f"{emoji} {icon} {event_type}", style=style))
+    logger.info(
+        Text(f"{emoji} {icon} {event_type}", style=style),
+        extra={"direction": direction, "event_type": event_type},
+    )
+
+def flush_ws_event_counts():
+    """Emit the pending high-frequency event counts, e.g. at the end of a session."""
+    ws_event_aggregator.flush(force=True)
 
 def log_tool_call(function_name, args, result):
     logger.info(Text(f"🛠️ Calling function: {function_name} with args: {args}", style="bold magenta"))
@@ -0,0 +1,136 @@
+import atexit
+import json
+import threading
+from collections import deque
+from datetime import datetime
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+class MetricsSink:
+    """
+    Buffers JSONL records in memory and appends them to file_path in batches.
+
+    A background thread flushes when max_batch records are pending or every
+    flush_interval seconds, and once more at shutdown. Durations passed to
+    record() also feed in-process counters and histograms, so they can be
+    queried without reading the file back.
+    """
+
+    def __init__(self, file_path, max_batch=50, flush_interval=2.0, histogram_samples=1000):
+        self.file_path = file_path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.histogram_samples = histogram_samples
+        self.lock = threading.Lock()
+        # flush() runs on the sink thread, in main's finally and at exit, one swap-and-append at a time
+        self.flush_lock = threading.Lock()
+        self.buffer = []
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.stopped = False
+
+        self.counters = {}
+        self.durations = {}  # name -> {"count", "total", "min", "max", "samples"}
+
+    def emit(self, record):
+        """Queue a raw record for the file."""
+        with self.lock:
+            self.buffer.append(record)
+            should_flush = len(self.buffer) >= self.max_batch
+            if self.thread is None and not self.stopped:
+                self._start()
+        if should_flush:
+            self.wakeup.set()
+
+    def record(self, name, duration):
+        """Record a duration in seconds, in the runtime_time_table format."""
+        with self.lock:
+            stats = self.durations.get(name)
+            if stats is None:
+                stats = self.durations[name] = {
+                    "count": 0,
+                    "total": 0.0,
+                    "min": duration,
+                    "max": duration,
+                    "samples": deque(maxlen=self.histogram_samples),
+                }
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["min"] = min(stats["min"], duration)
+            stats["max"] = max(stats["max"], duration)
+            stats["samples"].append(duration)
+        self.emit(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "function": name,
+                "duration": f"{duration:.4f}",
+            }
+        )
+
+    def increment(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def counter(self, name):
+        with self.lock:
+            return self.counters.get(name, 0)
+
+    def histogram(self, name):
+        """Count, mean, min and max over all durations, percentiles over the most recent samples."""
+        with self.lock:
+            stats = self.durations.get(name)
+            if stats is None:
+                return None
+            samples = sorted(stats["samples"])
+            return {
+                "count": stats["count"],
+                "mean": stats["total"] / stats["count"],
+                "min": stats["min"],
+                "max": stats["max"],
+                "p50": percentile(samples, 50),
+                "p95": percentile(samples, 95),
+                "p99": percentile(samples, 99),
+            }
+
+    def snapshot(self):
+        with self.lock:
+            counters = dict(self.counters)
+            names = list(self.durations)
+        return {"counters": counters, "histograms": {name: self.histogram(name) for name in names}}
+
+    def _start(self):
+        # Called with the lock held
+        self.thread = threading.Thread(target=self._run, name="metrics-sink", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self.stopped:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                records, self.buffer = self.buffer, []
+            if not records:
+                return
+            with open(self.file_path, "a") as file:
+                for record in records:
+                    json.dump(record, file)
+                    file.write("\n")
+
+    def close(self):
+        self.stopped = True
+        self.wakeup.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.flush()
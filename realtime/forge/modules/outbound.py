@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+import time
+
+from ...codec import dumps, encode_audio_append, AUDIO_APPEND_EVENT
+from .logging import log_ws_event, log_warning
+
+PRIORITY_CONTROL = 0  # session, commit, response.create and tool results
+PRIORITY_AUDIO = 1  # input_audio_buffer.append
+
+PRIORITY_NAMES = {PRIORITY_CONTROL: "control", PRIORITY_AUDIO: "audio"}
+
+
+class OutboundQueue:
+    """
+    Single writer task for the realtime WebSocket.
+
+    Control and tool-result events jump ahead of queued audio, events with the
+    same priority keep their order.
+    """
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.queue = asyncio.PriorityQueue()
+        self.sequence = itertools.count()
+        self.writer_task = None
+        self.closed = False
+
+        self.max_queue_depth = 0
+        self.sent = {priority: 0 for priority in PRIORITY_NAMES}
+        self.latency_total = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self.latency_max = {priority: 0.0 for priority in PRIORITY_NAMES}
+
+    def start(self):
+        if self.writer_task is None:
+            self.writer_task = asyncio.create_task(self._write_loop())
+
+    def send(self, event, priority=PRIORITY_CONTROL, on_sent=None):
+        """on_sent is called once the event has been written to the socket."""
+        if self.closed:
+            log_warning(f"⚠️ Dropping {event.get('type')}: outbound queue is closed.")
+            return
+        log_ws_event("Outgoing", event)
+        self.queue.put_nowait((priority, next(self.sequence), time.perf_counter(), event, on_sent))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def send_audio(self, audio_base64):
+        """Queue an input_audio_buffer.append, pre-encoded without going through the JSON encoder."""
+        if self.closed:
+            return
+        log_ws_event("Outgoing", AUDIO_APPEND_EVENT)
+        message = encode_audio_append(audio_base64)
+        self.queue.put_nowait((PRIORITY_AUDIO, next(self.sequence), time.perf_counter(), message, None))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    async def _write_loop(self):
+        while True:
+            priority, _, enqueued_at, event, on_sent = await self.queue.get()
+            try:
+                await self.websocket.send(event if isinstance(event, str) else dumps(event))
+            except Exception as e:
+                log_warning(f"⚠️ Outbound writer stopped: {e}")
+                self.closed = True
+                return
+            finally:
+                self.queue.task_done()
+
+            if on_sent is not None:
+                on_sent()
+            latency = time.perf_counter() - enqueued_at
+            self.sent[priority] += 1
+            self.latency_total[priority] += latency
+            self.latency_max[priority] = max(self.latency_max[priority], latency)
+
+    async def close(self):
+        self.closed = True
+        if self.writer_task is not None:
+            self.writer_task.cancel()
+            try:
+                await self.writer_task
+            except asyncio.CancelledError:
+                pass
+            self.writer_task = None
+
+    def metrics(self) -> dict:
+        metrics = {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+        }
+        for priority, name in PRIORITY_NAMES.items():
+            sent = self.sent[priority]
+            metrics[name] = {
+                "sent": sent,
+                "avg_send_latency_ms": round(1000 * self.latency_total[priority] / sent, 3) if sent else 0.0,
+                "max_send_latency_ms": round(1000 * self.latency_max[priority], 3),
+            }
+        return metrics
@@ -0,0 +1,94 @@
+from .logging import log_warning
+
+
+class ResponseScheduler:
+    """
+    Sends response.create only while no response is active.
+
+    The lifecycle is tracked from our own response.create and the server's
+    response.created / response.done events. Requests made while a response is
+    in flight are coalesced into a single response.create sent after
+    response.done, so we don't pay an "active response" error and retry.
+    Our response.create carries an event_id, an error answering it means the
+    response never started, so the scheduler is free again right away.
+    """
+
+    def __init__(self, outbound):
+        self.outbound = outbound
+        self.active = False
+        self.active_response_id = None
+        self.create_event_id = None  # our response.create waiting for response.created
+        self.pending = False
+
+        self.requested = 0
+        self.sent = 0
+        self.deferred = 0
+        self.coalesced = 0
+        self.collisions = 0
+        self.rejected = 0
+
+    def request(self) -> bool:
+        """Returns True if response.create was sent now, False if it was queued."""
+        self.requested += 1
+        if self.active:
+            if self.pending:
+                self.coalesced += 1
+            else:
+                self.deferred += 1
+            self.pending = True
+            return False
+        self._send()
+        return True
+
+    def _send(self):
+        # Active from the moment we send, a second request before response.created must wait too
+        self.active = True
+        self.pending = False
+        self.sent += 1
+        self.create_event_id = f"event_response_create_{self.sent}"
+        self.outbound.send({"type": "response.create", "event_id": self.create_event_id})
+
+    def on_response_created(self, response_id):
+        self.active = True
+        self.active_response_id = response_id
+        self.create_event_id = None
+
+    def on_response_done(self, response_id):
+        if self.active_response_id not in (None, response_id):
+            return
+        self.active = False
+        self.active_response_id = None
+        if self.pending:
+            self._send()
+
+    def on_active_response_error(self):
+        """Our response.create collided with a response we had not seen yet, retry after it is done."""
+        self.collisions += 1
+        self.active = True
+        self.create_event_id = None
+        self.pending = True
+        log_warning("⚠️ response.create collided with an active response, retrying after response.done")
+
+    def on_error(self, event_id) -> bool:
+        """Returns True if the error rejected our response.create, pending requests are sent again."""
+        # Errors about other client events carry their ids or none, ours always has one
+        if self.create_event_id is None or event_id != self.create_event_id:
+            return False
+        self.rejected += 1
+        self.active = False
+        self.create_event_id = None
+        log_warning("⚠️ response.create was rejected, the scheduler is free again")
+        if self.pending:
+            self._send()
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "requested": self.requested,
+            "sent": self.sent,
+            "deferred": self.deferred,
+            "coalesced": self.coalesced,
+            "collisions_avoided": self.deferred + self.coalesced,
+            "collisions": self.collisions,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,92 @@
+import threading
+
+
+class AudioRingBuffer:
+    """
+    Preallocated byte ring buffer between the PortAudio callback thread and the event loop.
+
+    Overflow policies:
+    - "overwrite": make room by discarding the oldest buffered audio
+    - "drop": reject incoming frames until the reader catches up
+    """
+
+    OVERWRITE = "overwrite"
+    DROP = "drop"
+
+    def __init__(self, capacity: int, frame_size: int, overflow_policy: str = OVERWRITE):
+        if overflow_policy not in (self.OVERWRITE, self.DROP):
+            raise ValueError(f"Unsupported overflow policy: {overflow_policy}")
+        self.frame_size = frame_size
+        self.capacity = max(frame_size, capacity - capacity % frame_size)
+        self.overflow_policy = overflow_policy
+        self.buffer = bytearray(self.capacity)
+        self.buffer_view = memoryview(self.buffer)
+        # Scratch space for reads, so a wrapped region can be returned as one contiguous view
+        self.out = bytearray(self.capacity)
+        self.out_view = memoryview(self.out)
+        self.read_pos = 0
+        self.size = 0
+        self.lock = threading.Lock()
+
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_overwritten = 0
+
+    def write(self, data) -> bool:
+        """Copy a frame into the buffer. Returns False if it was dropped."""
+        data = memoryview(data).cast("B")
+        with self.lock:
+            n = len(data)
+            if n > self.capacity:
+                data = data[n - self.capacity:]
+                n = self.capacity
+            free = self.capacity - self.size
+            if n > free:
+                if self.overflow_policy == self.DROP:
+                    self.frames_dropped += 1
+                    return False
+                overflow = n - free
+                self.read_pos = (self.read_pos + overflow) % self.capacity
+                self.size -= overflow
+                self.frames_overwritten += -(-overflow // self.frame_size)
+
+            write_pos = (self.read_pos + self.size) % self.capacity
+            first = min(n, self.capacity - write_pos)
+            self.buffer_view[write_pos:write_pos + first] = data[:first]
+            self.buffer_view[:n - first] = data[first:]
+            self.size += n
+            self.frames_written += 1
+        return True
+
+    def read(self, max_bytes: int = None):
+        """
+        Take up to max_bytes (everything by default) out of the buffer.
+
+        Returns a memoryview that stays valid until the next read, or None if empty.
+        """
+        with self.lock:
+            n = self.size if max_bytes is None else min(self.size, max_bytes)
+            if n == 0:
+                return None
+            first = min(n, self.capacity - self.read_pos)
+            self.out_view[:first] = self.buffer_view[self.read_pos:self.read_pos + first]
+            self.out_view[first:n] = self.buffer_view[:n - first]
+            self.read_pos = (self.read_pos + n) % self.capacity
+            self.size -= n
+        return self.out_view[:n]
+
+    def clear(self):
+        with self.lock:
+            self.read_pos = 0
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "buffered_bytes": self.size,
+                "capacity_bytes": self.capacity,
+                "overflow_policy": self.overflow_policy,
+                "frames_written": self.frames_written,
+                "frames_dropped": self.frames_dropped,
+                "frames_overwritten": self.frames_overwritten,
+            }
@@ -0,0 +1,131 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import tracing
+from .logging import log_info, log_warning
+from .utils import TOOL_MAX_WORKERS, TOOL_TIMEOUT_SECONDS
+
+
+class ToolTimeoutError(Exception):
+    pass
+
+
+class ToolRuntime:
+    """
+    Runs function_map tools without blocking the realtime event loop.
+
+    Synchronous tools run on a bounded thread pool, coroutine tools run on the
+    loop. Every call gets a timeout, and queue wait and run time are recorded
+    per tool. A thread can't be stopped: on timeout or cancellation the caller
+    stops waiting, but the tool's thread keeps running, and keeps its pool
+    slot, until the tool returns. Blocking calls inside tools therefore carry
+    their own shorter timeouts (TOOL_HTTP_TIMEOUT_SECONDS, LLM_TIMEOUT_SECONDS,
+    DB_TIMEOUT_SECONDS).
+    """
+
+    def __init__(
+        self,
+        function_map,
+        timeouts=None,
+        default_timeout=TOOL_TIMEOUT_SECONDS,
+        max_workers=TOOL_MAX_WORKERS,
+        on_record=None,
+    ):
+        self.function_map = function_map
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="forge-tool")
+        self.tasks = set()
+        self.stats = {}
+        # Called with (function_name, submitted_at, started_at, finished_at, outcome) after each call
+        self.on_record = on_record
+
+    def submit(self, coro):
+        """Schedule a tool call so the receive loop keeps processing events."""
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def run(self, function_name, args):
+        func = self.function_map[function_name]
+        timeout = self.timeouts.get(function_name, self.default_timeout)
+        submitted_at = time.perf_counter()
+        started_at = None
+
+        with tracing.span("tool", tool=function_name, timeout_s=timeout) as tool_span:
+            if asyncio.iscoroutinefunction(func):
+                async def call():
+                    nonlocal started_at
+                    started_at = time.perf_counter()
+                    return await func(**args)
+
+                pending = call()
+            else:
+                def call():
+                    nonlocal started_at
+                    started_at = time.perf_counter()
+                    return func(**args)
+
+                # Executor threads don't inherit contextvars, copy them so LLM and SQL spans nest under the tool
+                context = contextvars.copy_context()
+                pending = asyncio.get_running_loop().run_in_executor(self.executor, context.run, call)
+
+            outcome = "ok"
+            try:
+                return await asyncio.wait_for(pending, timeout)
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                raise ToolTimeoutError(f"'{function_name}' timed out after {timeout}s")
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                tool_span.set_attribute("outcome", outcome)
+                tool_span.set_attribute(
+                    "queue_wait_ms", round(1000 * ((started_at or time.perf_counter()) - submitted_at), 3)
+                )
+                self.record(function_name, submitted_at, started_at, outcome)
+
+    def record(self, function_name, submitted_at, started_at, outcome):
+        finished_at = time.perf_counter()
+        queue_wait = (started_at or finished_at) - submitted_at
+        run_time = finished_at - started_at if started_at else 0.0
+
+        stats = self.stats.setdefault(
+            function_name,
+            {"calls": 0, "ok": 0, "error": 0, "timeout": 0, "cancelled": 0,
+             "queue_wait_total": 0.0, "run_time_total": 0.0, "run_time_max": 0.0},
+        )
+        stats["calls"] += 1
+        stats[outcome] += 1
+        stats["queue_wait_total"] += queue_wait
+        stats["run_time_total"] += run_time
+        stats["run_time_max"] = max(stats["run_time_max"], run_time)
+
+        message = (
+            f"🧰 {function_name}() {outcome}: queue wait {queue_wait * 1000:.1f}ms, "
+            f"run {run_time * 1000:.1f}ms"
+        )
+        if outcome == "ok":
+            log_info(message, style="bold magenta")
+        else:
+            log_warning(message)
+
+        if self.on_record is not None:
+            self.on_record(function_name, submitted_at, started_at, finished_at, outcome)
+
+    async def cancel_all(self):
+        """Cancel in-flight tool calls, e.g. when the session ends."""
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,7 +1,6 @@
 import os
 import random
-import requests
-from pydantic import BaseModel
+from functools import lru_cache
 from typing import Any
 from datetime import datetime
 
@@ -11,11 +10,12 @@ from .logging import log_info
 from .utils import (
     timeit_decorator,
     personalization,
+    TOOL_HTTP_TIMEOUT_SECONDS,
 )
 from .database import get_database_instance
 
 @timeit_decorator
-async def get_ingest_memory() -> dict:
+def get_ingest_memory() -> dict:
     """
     Returns the current memory content using memory_manager.
     """
@@ -29,7 +29,7 @@ async def get_ingest_memory() -> dict:
     }
 
 @timeit_decorator
-async def add_to_memory(key: str, value: Any) -> dict:
+def add_to_memory(key: str, value: Any) -> dict:
     """
     Adds a key-value pair to the memory using memory_manager.
     """
@@ -62,18 +62,27 @@ class OutputFormat(str, Enum):
     JSON_ARRAY = ".json"
 
 
-class GenerateSQLResponse(BaseModel):
-    file_name: str
-    sql_query: str
-    output_format: OutputFormat
+@lru_cache(maxsize=None)
+def generate_sql_response_model():
+    """Build the structured output model on first use, pydantic is slow to import."""
+    from pydantic import BaseModel
+
+    class GenerateSQLResponse(BaseModel):
+        file_name: str
+        sql_query: str
+        output_format: OutputFormat
+
+    return GenerateSQLResponse
 
 
 @timeit_decorator
-async def send_message_telegram_bot(first_name: str, missing_data: str, success=True) -> dict:
+def send_message_telegram_bot(first_name: str, missing_data: str, success=True) -> dict:
     """
     Send a message to a Telegram bot based on the user's prompt and chat_id.
     Simulate a SMS message to the user.
     """
+    import requests
+
     # Step 2: Send the message to the Telegram bot
     try:
 
@@ -100,7 +109,7 @@ async def send_message_telegram_bot(first_name: str, missing_data: str, success=
 
         log_info(f"📖 send_message_telegram_bot() URL: {url}" , style="bold magenta")
 
-        response = requests.post(url, data=payload)
+        response = requests.post(url, data=payload, timeout=TOOL_HTTP_TIMEOUT_SECONDS)
 
         log_info(f"📖 send_message_telegram_bot() Response: {response.json()}", style="bold magenta")
 
@@ -117,7 +126,7 @@ async def send_message_telegram_bot(first_name: str, missing_data: str, success=
 
 
 @timeit_decorator
-async def update_patient_missing_data(missing_data: dict, patient_name: str) -> dict:
+def update_patient_missing_data(missing_data: dict, patient_name: str) -> dict:
     """
     Update the patient's record in the 'patient' table with missing data.
     The missing_data parameter should be a JSON string containing key-value pairs
@@ -164,7 +173,7 @@ async def update_patient_missing_data(missing_data: dict, patient_name: str) ->
     </missing-data>
     """
 
-    response = structured_output_prompt(prompt_structure, GenerateSQLResponse)
+    response = structured_output_prompt(prompt_structure, generate_sql_response_model())
     if not response:
         return {"status": "error", "message": "Failed to generate update query."}
 
@@ -192,6 +201,13 @@ function_map = {
     "update_patient_missing_data": update_patient_missing_data,
 }
 
+# Per-tool timeouts in seconds, tools not listed use TOOL_TIMEOUT_SECONDS.
+# Blocking tools are plain functions so they run on the tool thread pool.
+tool_timeouts = {
+    "send_message_telegram_bot": 10,
+    "update_patient_missing_data": 30,
+}
+
 tools = [
     {
         "type": "function",
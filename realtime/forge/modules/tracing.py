@@ -0,0 +1,165 @@
+"""
+Lightweight span tracing for turns, tools, LLM requests and SQL statements.
+
+The active span lives in a contextvar, so spans opened inside a tool (or on a
+worker thread started with copy_context) nest under it automatically.
+Finished spans are appended to TRACE_LOG_JSON through a buffered sink.
+
+Convert a trace file for flame/waterfall views in Perfetto or chrome://tracing:
+
+    python -m realtime.forge.modules.tracing config/traces.jsonl traces.json
+"""
+
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+from .metrics import MetricsSink
+
+TRACE_LOG_JSON = os.getenv("TRACE_FILE", "config/traces.jsonl")
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_exporter = None
+
+
+def get_exporter():
+    global _exporter
+    if _exporter is None:
+        _exporter = MetricsSink(TRACE_LOG_JSON)
+    return _exporter
+
+
+class Span:
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.start_time = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_error(self, error):
+        self.status = "error"
+        self.attributes["error"] = repr(error)
+
+    def end(self):
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self.start
+        get_exporter().emit(self.to_record())
+
+    def to_record(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(1000 * self.duration, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+def current_span():
+    return _current_span.get()
+
+
+def start_span(name, **attributes):
+    """Start a span under the current one without activating it, end it with span.end()."""
+    return Span(name, _current_span.get(), attributes)
+
+
+def activate(span):
+    """Make span the parent of spans opened later in this context, e.g. a turn in the receive loop."""
+    _current_span.set(span)
+
+
+@contextmanager
+def span(name, **attributes):
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def traced(name=None, **attributes):
+    """Decorator version of span() for sync and async functions."""
+
+    def decorator(func):
+        span_name = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return sync_wrapper
+
+    return decorator
+
+
+def to_chrome_trace(jsonl_path, output_path):
+    """Convert exported spans to the Chrome trace event format, one track per trace."""
+    events = []
+    tracks = {}
+    with open(jsonl_path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            track = tracks.setdefault(record["trace_id"], len(tracks) + 1)
+            events.append(
+                {
+                    "name": record["name"],
+                    "cat": record["name"].split(".")[0],
+                    "ph": "X",
+                    "ts": record["start"] * 1e6,
+                    "dur": record["duration_ms"] * 1e3,
+                    "pid": 1,
+                    "tid": track,
+                    "args": {**record["attributes"], "status": record["status"]},
+                }
+            )
+    with open(output_path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+    return len(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert forge spans to a Chrome trace file.")
+    parser.add_argument("input", nargs="?", default=TRACE_LOG_JSON)
+    parser.add_argument("output", nargs="?", default="traces.json")
+    args = parser.parse_args()
+    count = to_chrome_trace(args.input, args.output)
+    print(f"Wrote {count} spans to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import time
+from datetime import datetime
+
+from . import tracing
+from .logging import log_info
+from .metrics import MetricsSink, percentile
+from .utils import TURN_TIMELINE_LOG_JSON
+
+TURN_MARKS = (
+    "speech_started",
+    "speech_stopped",
+    "commit_sent",
+    "response_created",
+    "first_audio_delta",
+    "first_playback_sample",
+    "response_done",
+    "playback_end",
+)
+
+# Marks that keep their latest occurrence, e.g. the last response.done of a turn with tool calls
+LAST_OCCURRENCE_MARKS = {"response_done", "playback_end"}
+
+# (segment name, from mark, to mark)
+TURN_SEGMENTS = (
+    ("speech_stopped_to_commit_sent", "speech_stopped", "commit_sent"),
+    ("speech_stopped_to_response_created", "speech_stopped", "response_created"),
+    ("response_created_to_first_audio_delta", "response_created", "first_audio_delta"),
+    ("first_audio_delta_to_first_playback_sample", "first_audio_delta", "first_playback_sample"),
+    ("speech_stopped_to_first_playback_sample", "speech_stopped", "first_playback_sample"),
+    ("response_created_to_response_done", "response_created", "response_done"),
+    ("response_done_to_playback_end", "response_done", "playback_end"),
+    ("turn_total", "speech_stopped", "playback_end"),
+)
+
+SUMMARY_PERCENTILES = (50, 95, 99)
+
+
+class Turn:
+    def __init__(self, turn_id):
+        self.turn_id = turn_id
+        self.marks = {}
+        self.spans = []
+        self.span = None
+
+    def mark(self, name, at=None):
+        at = time.perf_counter() if at is None else at
+        if name in LAST_OCCURRENCE_MARKS or name not in self.marks:
+            self.marks[name] = at
+
+    def add_span(self, name, start, end, **attributes):
+        self.spans.append({"name": name, "start": start, "end": end, **attributes})
+
+    def segments_ms(self):
+        segments = {}
+        for name, start_mark, end_mark in TURN_SEGMENTS:
+            if start_mark in self.marks and end_mark in self.marks:
+                segments[name] = round(1000 * (self.marks[end_mark] - self.marks[start_mark]), 1)
+        return segments
+
+    def to_record(self, playback_mode):
+        origin = min(self.marks.values()) if self.marks else 0.0
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "turn": self.turn_id,
+            "playback_mode": playback_mode,
+            "marks_ms": {
+                name: round(1000 * (self.marks[name] - origin), 1)
+                for name in TURN_MARKS
+                if name in self.marks
+            },
+            "segments_ms": self.segments_ms(),
+            "spans": [
+                {
+                    **span,
+                    "start": round(1000 * (span["start"] - origin), 1),
+                    "end": round(1000 * (span["end"] - origin), 1),
+                }
+                for span in self.spans
+            ],
+        }
+
+
+class TurnTimeline:
+    """
+    Collects latency marks for each conversational turn.
+
+    Each finished turn is appended as one JSON line to TURN_TIMELINE_LOG_JSON,
+    and summary() reports p50/p95/p99 per segment for the whole session.
+    """
+
+    def __init__(self, playback_mode, file_path=TURN_TIMELINE_LOG_JSON):
+        self.playback_mode = playback_mode
+        self.sink = MetricsSink(file_path)
+        self.current = None
+        self.turn_count = 0
+        self.segment_values = {name: [] for name, _, _ in TURN_SEGMENTS}
+
+    def start_turn(self):
+        if self.current is not None:
+            # Interrupted before playback finished, keep what we measured
+            self.finish_turn()
+        self.turn_count += 1
+        self.current = Turn(self.turn_count)
+        # Root span for the turn, tool calls scheduled from this context nest under it
+        self.current.span = tracing.start_span("turn", turn=self.turn_count, playback_mode=self.playback_mode)
+        tracing.activate(self.current.span)
+        return self.current
+
+    def mark(self, name, at=None):
+        if self.current is None:
+            self.start_turn()
+        self.current.mark(name, at)
+
+    def add_span(self, name, start, end, **attributes):
+        if self.current is None:
+            self.start_turn()
+        self.current.add_span(name, start, end, **attributes)
+
+    def finish_turn(self):
+        turn, self.current = self.current, None
+        if turn is None:
+            return None
+        if tracing.current_span() is turn.span:
+            tracing.activate(None)
+        if not turn.marks:
+            turn.span.end()
+            return None
+        record = turn.to_record(self.playback_mode)
+        turn.span.attributes.update(record["segments_ms"])
+        turn.span.end()
+        for name, value in record["segments_ms"].items():
+            self.segment_values[name].append(value)
+
+        self.sink.emit(record)
+
+        segments = ", ".join(f"{name}={value}ms" for name, value in record["segments_ms"].items())
+        log_info(f"🧭 Turn {turn.turn_id}: {segments}", style="bold cyan")
+        return record
+
+    def summary(self):
+        summary = {}
+        for name, values in self.segment_values.items():
+            if not values:
+                continue
+            values = sorted(values)
+            summary[name] = {"count": len(values)}
+            for pct in SUMMARY_PERCENTILES:
+                summary[name][f"p{pct}"] = percentile(values, pct)
+        return summary
@@ -3,19 +3,41 @@ import time
 import json
 import os
 import asyncio
-from datetime import datetime
 from enum import Enum
 import pyaudio
 import tempfile
 import subprocess
 
+from .metrics import MetricsSink
+
 RUN_TIME_TABLE_LOG_JSON = "config/runtime_time_table.jsonl"
+TURN_TIMELINE_LOG_JSON = "config/turn_timeline.jsonl"
+
+# Buffered metrics sink
+METRICS_FLUSH_BATCH = 50  # records buffered before a flush is triggered
+METRICS_FLUSH_SECONDS = 2.0  # maximum time a record waits in memory
+METRICS_HISTOGRAM_SAMPLES = 1000  # recent durations kept per metric for percentiles
+
+# Shared by timeit_decorator and log_runtime, replaces a file append per call
+metrics_sink = MetricsSink(
+    RUN_TIME_TABLE_LOG_JSON,
+    max_batch=METRICS_FLUSH_BATCH,
+    flush_interval=METRICS_FLUSH_SECONDS,
+    histogram_samples=METRICS_HISTOGRAM_SAMPLES,
+)
 
 # Audio recording parameters
-CHUNK = 1024
+UPLINK_FRAME_MS = 40  # microphone frame size sent per input_audio_buffer.append, e.g. 20, 40 or 100
+MIC_BUFFER_SECONDS = 5  # capture backlog kept while the uplink is stalled
+MIC_OVERFLOW_POLICY = "overwrite"  # "overwrite" drops the oldest audio, "drop" rejects new frames
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 24000
+SAMPLE_WIDTH = 2  # bytes per sample for paInt16
+
+# Output device parameters
+PLAYER_FRAMES_PER_BUFFER = 480  # 20ms at 24kHz
+PLAYER_MAX_BUFFER_SECONDS = 60
 
 
 class ModelName(str, Enum):
@@ -45,19 +67,8 @@ def timeit_decorator(func):
         duration = round(end_time - start_time, 4)
         print(f"⏰ {func.__name__}() took {duration:.4f} seconds")
 
-        jsonl_file = RUN_TIME_TABLE_LOG_JSON
-
-        # Create new time record
-        time_record = {
-            "timestamp": datetime.now().isoformat(),
-            "function": func.__name__,
-            "duration": f"{duration:.4f}",
-        }
-
-        # Append the new record to the JSONL file
-        with open(jsonl_file, "a") as file:
-            json.dump(time_record, file)
-            file.write("\n")
+        # Buffered, the sink appends to RUN_TIME_TABLE_LOG_JSON from a background thread
+        metrics_sink.record(func.__name__, duration)
 
         return result
 
@@ -69,19 +80,8 @@ def timeit_decorator(func):
         duration = round(end_time - start_time, 4)
         print(f"⏰ {func.__name__}() took {duration:.4f} seconds")
 
-        jsonl_file = RUN_TIME_TABLE_LOG_JSON
-
-        # Create new time record
-        time_record = {
-            "timestamp": datetime.now().isoformat(),
-            "function": func.__name__,
-            "duration": f"{duration:.4f}",
-        }
-
-        # Append the new record to the JSONL file
-        with open(jsonl_file, "a") as file:
-            json.dump(time_record, file)
-            file.write("\n")
+        # Buffered, the sink appends to RUN_TIME_TABLE_LOG_JSON from a background thread
+        metrics_sink.record(func.__name__, duration)
 
         return result
 
@@ -119,6 +119,27 @@ PREFIX_PADDING_MS = 300
 SILENCE_THRESHOLD = 0.5
 SILENCE_DURATION_MS = 700
 
+# "streaming" plays audio deltas as they arrive, "buffered" waits for response.done
+PLAYBACK_MODE = "streaming"
+PLAYBACK_MODES = ("streaming", "buffered")
+
+# Tool execution
+TOOL_MAX_WORKERS = 4
+TOOL_TIMEOUT_SECONDS = 15  # default, override per tool with tool_timeouts in tools.py
+# Timeouts of the blocking calls inside tools, kept below the tool timeouts: a timed-out tool's thread
+# keeps running until its blocking call returns, and holds a TOOL_MAX_WORKERS slot until then
+TOOL_HTTP_TIMEOUT_SECONDS = 8
+LLM_TIMEOUT_SECONDS = 12
+DB_TIMEOUT_SECONDS = 5
+
+# Conversation context budget
+CONTEXT_TOKEN_BUDGET = 8000  # input tokens per response before old items are removed
+CONTEXT_TARGET_RATIO = 0.6  # prune down to this fraction of the budget
+CONTEXT_KEEP_RECENT_ITEMS = 6  # latest items never removed
+CONTEXT_PRUNE_MODE = "delete"  # "delete" drops old items, "summarize" keeps a transcript digest
+CONTEXT_PRUNE_MODES = ("delete", "summarize")
+CONTEXT_DIGEST_MAX_CHARS = 2000
+
 
 def match_pattern(pattern: str, key: str) -> bool:
     if pattern == "*":
@@ -0,0 +1,90 @@
+import asyncio
+
+from realtime.api.admission import Admission, overflow_twiml, BUSY, CALLBACK
+
+
+def test_reserve_until_full_then_reject():
+    async def main():
+        admission = Admission(max_calls=2, queue_size=0)
+        return [await admission.reserve() for _ in range(3)], admission.stats()
+
+    results, stats = asyncio.run(main())
+
+    assert results == [True, True, False]
+    assert stats["reserved"] == 2
+    assert stats["admitted"] == 2
+    assert stats["rejected"] == 1
+
+
+def test_queued_call_gets_the_slot_of_an_ended_call():
+    async def main():
+        admission = Admission(max_calls=1, queue_size=1, queue_timeout=5)
+        assert await admission.reserve()
+        assert admission.start_call()
+        waiting = asyncio.create_task(admission.reserve())
+        await asyncio.sleep(0.01)
+        assert admission.stats()["queued"] == 1
+        admission.end_call()
+        return await waiting, admission.stats()
+
+    admitted, stats = asyncio.run(main())
+
+    assert admitted is True
+    assert stats["active"] == 0
+    assert stats["reserved"] == 1
+    assert stats["queued_total"] == 1
+
+
+def test_queue_timeout_and_full_queue_reject():
+    async def main():
+        admission = Admission(max_calls=1, queue_size=1, queue_timeout=0.05)
+        assert await admission.reserve()
+        return await asyncio.gather(admission.reserve(), admission.reserve()), admission.stats()
+
+    results, stats = asyncio.run(main())
+
+    # The first waits in the queue and times out, the second finds the queue full
+    assert sorted(results) == [False, False]
+    assert stats["queue_timeouts"] == 1
+    assert stats["rejected"] == 2
+
+
+def test_unclaimed_reservations_expire():
+    async def main():
+        admission = Admission(max_calls=1, queue_size=0, reservation_seconds=0.05)
+        assert await admission.reserve()
+        assert not await admission.reserve()
+        await asyncio.sleep(0.1)
+        return await admission.reserve(), admission.stats()
+
+    admitted, stats = asyncio.run(main())
+
+    assert admitted is True
+    assert stats["expired_reservations"] == 1
+
+
+def test_media_stream_without_reservation_on_a_full_worker_is_rejected():
+    async def main():
+        admission = Admission(max_calls=1)
+        assert admission.start_call()
+        return admission.start_call(), admission.stats()
+
+    started, stats = asyncio.run(main())
+
+    assert started is False
+    assert stats["active"] == 1
+    assert stats["rejected_streams"] == 1
+
+
+def test_no_limit():
+    async def main():
+        admission = Admission(max_calls=0, queue_size=0)
+        return all([await admission.reserve() for _ in range(50)])
+
+    assert asyncio.run(main())
+
+
+def test_overflow_twiml():
+    assert '<Reject reason="busy"' in overflow_twiml(BUSY)
+    callback = overflow_twiml(CALLBACK)
+    assert "<Say>" in callback and "<Hangup" in callback
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pyaudio")
+
+from realtime.forge.modules.audio import AudioPlayer
+
+
+def test_empty_write_does_not_block_drain():
+    async def main():
+        player = AudioPlayer()
+        player.write(b"")
+        await asyncio.wait_for(player.drain(), timeout=1)
+        return player
+
+    player = asyncio.run(main())
+    assert not player.buffer
+
+
+def test_write_waits_for_the_callback_to_drain():
+    async def main():
+        player = AudioPlayer()
+        player.loop = asyncio.get_running_loop()
+        player.write(b"\x01\x02" * 10)
+        assert not player.drained.is_set()
+        # What the PyAudio callback thread does once per device buffer
+        player.callback(None, 1024, None, None)
+        await asyncio.wait_for(player.drain(), timeout=1)
+        return player
+
+    player = asyncio.run(main())
+    assert player.first_sample_at is not None
+    assert player.drained_at is not None
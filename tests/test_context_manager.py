@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("pyaudio")
+
+from realtime.forge.modules.context_manager import ContextManager
+
+
+class RecordingOutbound:
+    def __init__(self):
+        self.events = []
+
+    def send(self, event):
+        self.events.append(event)
+
+
+def created(item_id, role="user", item_type="message", text=None):
+    item = {"id": item_id, "type": item_type, "role": role}
+    if text is not None:
+        item["content"] = [{"type": "input_text", "text": text}]
+    return {"type": "conversation.item.created", "item": item}
+
+
+def make_manager(mode="delete"):
+    outbound = RecordingOutbound()
+    manager = ContextManager(outbound, token_budget=1000, keep_recent=3, mode=mode, target_ratio=0.5)
+    for index in range(6):
+        manager.on_item_created(created(f"item_{index}", text=f"message {index}"))
+    manager.on_item_created(created("call_1", role=None, item_type="function_call"))
+    manager.on_item_created(created("item_6", text="message 6"))
+    return manager, outbound
+
+
+def test_under_budget_nothing_is_deleted():
+    manager, outbound = make_manager()
+    manager.on_response_done({"output": [], "usage": {"input_tokens": 900}})
+
+    assert outbound.events == []
+
+
+def test_over_budget_deletes_the_oldest_unpinned_items():
+    manager, outbound = make_manager()
+    manager.on_response_done({"output": [], "usage": {"input_tokens": 2000}})
+
+    deleted = [event["item_id"] for event in outbound.events if event["type"] == "conversation.item.delete"]
+    # 75% of the tokens are over the target, so 6 of 8 items would go, the recent three always stay
+    assert deleted == ["item_0", "item_1", "item_2", "item_3", "item_4"]
+    assert manager.stats()["items_deleted"] == 5
+
+    # Items being deleted aren't picked again before the server confirms
+    manager.on_response_done({"output": [], "usage": {"input_tokens": 2000}})
+    assert [event["item_id"] for event in outbound.events[5:]] == []
+
+    for item_id in deleted:
+        manager.on_item_deleted({"item_id": item_id})
+    assert list(manager.items) == ["item_5", "call_1", "item_6"]
+
+
+def test_summarize_replaces_deleted_items_with_a_pinned_digest():
+    manager, outbound = make_manager(mode="summarize")
+    manager.on_response_done({"output": [], "usage": {"input_tokens": 2000}})
+
+    digest = next(event for event in outbound.events if event["type"] == "conversation.item.create")
+    text = digest["item"]["content"][0]["text"]
+    assert "user: message 0" in text
+    assert "message 5" not in text
+
+    manager.on_item_created({"type": "conversation.item.created", "item": digest["item"]})
+    assert manager.items[digest["item"]["id"]]["pinned"]
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from realtime.api.call_registry import CallRegistry
+from realtime.api.dialer import Dialer, StubTwilioClient, TokenBucket
+
+
+def make_dialer(tmp_path, rate_per_second):
+    registry = CallRegistry(str(tmp_path / "call_registry.db"))
+    client = StubTwilioClient(latency=0.05)
+    return Dialer(client, "+15550000000", "<Response/>", registry, rate_per_second=rate_per_second, concurrency=4)
+
+
+async def wait_for_job(dialer, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await dialer.job(job_id)
+        if job["done"]:
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_dial_job_is_paced_and_records_each_number(tmp_path):
+    numbers = ["+15550000001", "+15550000002", "bad", "+15550000003", "+15550000004"]
+    rate = 10
+
+    async def main():
+        dialer = make_dialer(tmp_path, rate)
+        try:
+            started = time.monotonic()
+            job_id = await dialer.submit(numbers)
+            job = await wait_for_job(dialer, job_id)
+            return job, time.monotonic() - started, dialer.stats()
+        finally:
+            dialer.close()
+
+    job, elapsed, stats = asyncio.run(main())
+
+    # The first call uses the burst token, every other one waits for a refill
+    assert elapsed >= (len(numbers) - 1) / rate
+    assert [number["phone_number"] for number in job["numbers"]] == numbers
+    assert job["counts"] == {"initiated": 4, "failed": 1}
+    for number in job["numbers"]:
+        if number["phone_number"] == "bad":
+            assert number["status"] == "failed"
+            assert number["call_sid"] is None
+            assert "not a valid phone number" in number["error"]
+        else:
+            assert number["status"] == "initiated"
+            assert number["call_sid"].startswith("CA")
+            assert number["error"] is None
+    assert stats["initiated"] == 4
+    assert stats["failed"] == 1
+
+
+def test_unknown_job(tmp_path):
+    async def main():
+        dialer = make_dialer(tmp_path, 1)
+        try:
+            return await dialer.job("missing")
+        finally:
+            dialer.close()
+
+    assert asyncio.run(main()) is None
+
+
+def test_old_jobs_are_pruned(tmp_path):
+    registry = CallRegistry(str(tmp_path / "call_registry.db"), dial_retention_seconds=60)
+    registry.dial_job_created("old", ["+15550000001"])
+    registry.execute("UPDATE dial_numbers SET updated_at = updated_at - 120 WHERE job_id = 'old'")
+    registry.dial_job_created("new", ["+15550000002"])
+
+    assert registry.dial_job("old") is None
+    assert registry.dial_job("new")[0]["status"] == "queued"
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0)])
+def test_token_bucket_rejects_bad_limits(rate, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, burst)
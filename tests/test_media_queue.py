@@ -0,0 +1,66 @@
+import asyncio
+
+from realtime.api.media_queue import MediaQueue, DROP_NEWEST, DROP_OLDEST
+
+
+async def drain(queue):
+    items = []
+    while queue.depth():
+        items.append((await queue.get())[4])
+    return items
+
+
+def test_control_items_go_ahead_of_queued_media():
+    async def main():
+        queue = MediaQueue("uplink", 10, DROP_OLDEST)
+        queue.put(["audio_1"], media=True)
+        queue.put(["audio_2"], media=True)
+        queue.put(["truncate", "cancel"])
+        return await drain(queue)
+
+    assert asyncio.run(main()) == [["truncate", "cancel"], ["audio_1"], ["audio_2"]]
+
+
+def test_drop_oldest_keeps_the_newest_media():
+    async def main():
+        queue = MediaQueue("uplink", 2, DROP_OLDEST)
+        for index in range(4):
+            queue.put([f"audio_{index}"], media=True)
+        return await drain(queue), queue.stats()
+
+    items, stats = asyncio.run(main())
+
+    assert items == [["audio_2"], ["audio_3"]]
+    assert stats["dropped"] == 2
+
+
+def test_bounded_by_queued_ms():
+    async def main():
+        queue = MediaQueue("downlink", 0, DROP_NEWEST, max_ms=250)
+        for index in range(4):
+            queue.put([f"audio_{index}"], media=True, duration_ms=100)
+        full = queue.full()
+        await queue.get()
+        return full, queue.full(), queue.stats()
+
+    full, full_after_get, stats = asyncio.run(main())
+
+    assert full
+    assert not full_after_get
+    assert stats["dropped"] == 1
+    assert stats["queued_ms"] == 200
+
+
+def test_clear_media_keeps_control_items():
+    async def main():
+        queue = MediaQueue("downlink", 0, DROP_NEWEST, max_ms=1000)
+        queue.put(["audio"], media=True, duration_ms=100)
+        queue.put(["clear"])
+        queue.clear_media()
+        return queue.stats(), await drain(queue)
+
+    stats, items = asyncio.run(main())
+
+    assert stats["cleared"] == 1
+    assert stats["queued_ms"] == 0
+    assert items == [["clear"]]
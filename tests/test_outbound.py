@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+from realtime.forge.modules.outbound import OutboundQueue
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def test_control_events_jump_ahead_of_queued_audio():
+    async def main():
+        websocket = RecordingWebSocket()
+        outbound = OutboundQueue(websocket)
+        sent = []
+        outbound.send_audio("AAAA")
+        outbound.send_audio("BBBB")
+        outbound.send({"type": "input_audio_buffer.commit"}, on_sent=lambda: sent.append("commit"))
+        outbound.send({"type": "response.create"})
+        outbound.start()
+        await asyncio.wait_for(outbound.queue.join(), timeout=1)
+        await outbound.close()
+        return websocket.sent, sent, outbound.metrics()
+
+    messages, sent, metrics = asyncio.run(main())
+
+    assert [message["type"] for message in messages] == [
+        "input_audio_buffer.commit",
+        "response.create",
+        "input_audio_buffer.append",
+        "input_audio_buffer.append",
+    ]
+    # Audio keeps its order
+    assert [message["audio"] for message in messages[2:]] == ["AAAA", "BBBB"]
+    assert sent == ["commit"]
+    assert metrics["control"]["sent"] == 2
+    assert metrics["audio"]["sent"] == 2
+
+
+def test_sends_after_close_are_dropped():
+    async def main():
+        websocket = RecordingWebSocket()
+        outbound = OutboundQueue(websocket)
+        outbound.start()
+        await outbound.close()
+        outbound.send({"type": "response.create"})
+        outbound.send_audio("AAAA")
+        return outbound.queue.qsize()
+
+    assert asyncio.run(main()) == 0
@@ -0,0 +1,114 @@
+import json
+
+from realtime.api.barge_in import BargeInStats, PlaybackTracker, GREETING_ITEM, audio_ms
+from realtime.codec import BYTES_PER_MS
+
+
+def make_tracker():
+    tracker = PlaybackTracker(stats=BargeInStats())
+    tracker.stream_sid = "MZ1"
+    return tracker
+
+
+def test_audio_ms():
+    assert audio_ms("f" * 4 * 80) == 240 / BYTES_PER_MS
+    assert audio_ms("ff8=") == 2 / BYTES_PER_MS
+
+
+def test_marks_carry_the_item_and_the_cumulative_ms():
+    tracker = make_tracker()
+
+    first = json.loads(tracker.on_audio_sent("item_1", 100.0))
+    second = json.loads(tracker.on_audio_sent("item_1", 50.0))
+
+    assert first == {"event": "mark", "streamSid": "MZ1", "mark": {"name": "item_1:100"}}
+    assert second["mark"]["name"] == "item_1:150"
+
+
+def test_interrupt_truncates_to_the_last_echoed_mark():
+    tracker = make_tracker()
+    tracker.response_active = True
+    for _ in range(5):
+        tracker.on_audio_sent("item_1", 100.0)
+    tracker.on_mark("item_1:200")
+    tracker.on_mark("item_1:100")  # Late echoes never move playback back
+
+    to_twilio, to_openai = tracker.interrupt()
+
+    assert [json.loads(message) for message in to_twilio] == [{"event": "clear", "streamSid": "MZ1"}]
+    assert [json.loads(message) for message in to_openai] == [
+        {"type": "conversation.item.truncate", "item_id": "item_1", "content_index": 0, "audio_end_ms": 200},
+        {"type": "response.cancel"},
+    ]
+    assert tracker.stats.discarded_ms == 300
+    # Frames of the interrupted item still in flight are dropped
+    assert tracker.on_audio_sent("item_1", 100.0) is None
+
+
+def test_interrupt_after_playback_finished_sends_nothing():
+    tracker = make_tracker()
+    tracker.on_audio_sent("item_1", 100.0)
+    tracker.on_mark("item_1:100")
+
+    assert tracker.interrupt() == ([], [])
+    assert tracker.stats.interruptions == 0
+
+
+def test_marks_of_a_previous_item_are_ignored():
+    tracker = make_tracker()
+    tracker.on_audio_sent("item_1", 100.0)
+    tracker.on_audio_sent("item_2", 100.0)
+    tracker.on_mark("item_1:100")
+
+    assert tracker.played_ms == 0
+    assert tracker.playing()
+
+
+def test_greeting_is_cleared_but_not_truncated():
+    tracker = make_tracker()
+    tracker.on_audio_sent(GREETING_ITEM, 2000.0)
+
+    to_twilio, to_openai = tracker.interrupt()
+
+    assert len(to_twilio) == 1
+    assert to_openai == []
+
+
+def test_dropped_frame_cuts_the_rest_of_the_item():
+    tracker = make_tracker()
+    tracker.response_active = True
+    tracker.on_audio_sent("item_1", 100.0)
+    tracker.on_audio_sent("item_1", 100.0)
+
+    to_openai = [json.loads(message) for message in tracker.on_audio_dropped("item_1", 100.0)]
+
+    # Truncated to what was sent, the caller hears exactly that
+    assert to_openai == [
+        {"type": "response.cancel"},
+        {"type": "conversation.item.truncate", "item_id": "item_1", "content_index": 0, "audio_end_ms": 200},
+    ]
+    assert tracker.on_audio_dropped("item_1", 100.0) == []
+    # Later frames of the item are dropped even when the queue has room again
+    assert tracker.on_audio_sent("item_1", 100.0) is None
+    assert tracker.sent_ms == 200
+    assert tracker.stats.overflow_cuts == 1
+    assert tracker.stats.overflow_dropped_ms == 300
+
+    # A barge-in during the remaining playback truncates to the heard position
+    tracker.on_mark("item_1:100")
+    _, to_openai = tracker.interrupt()
+    assert [json.loads(message) for message in to_openai] == [
+        {"type": "conversation.item.truncate", "item_id": "item_1", "content_index": 0, "audio_end_ms": 100},
+    ]
+
+
+def test_dropped_first_frame_truncates_the_new_item_to_nothing():
+    tracker = make_tracker()
+    tracker.on_audio_sent("item_1", 100.0)
+
+    to_openai = [json.loads(message) for message in tracker.on_audio_dropped("item_2", 100.0)]
+
+    assert to_openai == [
+        {"type": "conversation.item.truncate", "item_id": "item_2", "content_index": 0, "audio_end_ms": 0},
+    ]
+    assert tracker.item_id == "item_1"
@@ -0,0 +1,92 @@
+from realtime.forge.modules.response_scheduler import ResponseScheduler
+
+
+class RecordingOutbound:
+    def __init__(self):
+        self.events = []
+
+    def send(self, event):
+        self.events.append(event)
+
+    def creates(self):
+        return [event for event in self.events if event["type"] == "response.create"]
+
+
+def test_requests_during_a_response_are_coalesced_into_one_create():
+    outbound = RecordingOutbound()
+    scheduler = ResponseScheduler(outbound)
+
+    assert scheduler.request() is True
+    scheduler.on_response_created("resp_1")
+    assert scheduler.request() is False
+    assert scheduler.request() is False
+    assert len(outbound.creates()) == 1
+
+    scheduler.on_response_done("resp_1")
+    assert len(outbound.creates()) == 2
+    assert scheduler.active
+    assert scheduler.stats()["coalesced"] == 1
+    assert scheduler.stats()["deferred"] == 1
+
+
+def test_response_done_of_another_response_is_ignored():
+    outbound = RecordingOutbound()
+    scheduler = ResponseScheduler(outbound)
+
+    scheduler.request()
+    scheduler.on_response_created("resp_1")
+    scheduler.on_response_done("resp_other")
+    assert scheduler.active
+
+    scheduler.on_response_done("resp_1")
+    assert not scheduler.active
+
+
+def test_rejected_create_frees_the_scheduler_and_resends_pending():
+    outbound = RecordingOutbound()
+    scheduler = ResponseScheduler(outbound)
+
+    scheduler.request()
+    create_event_id = outbound.creates()[0]["event_id"]
+    scheduler.request()
+
+    assert scheduler.on_error(create_event_id) is True
+    # The pending request went out right away, with a new event id
+    creates = outbound.creates()
+    assert len(creates) == 2
+    assert creates[1]["event_id"] != create_event_id
+    assert scheduler.active
+    assert scheduler.stats()["rejected"] == 1
+
+    assert scheduler.on_error(creates[1]["event_id"]) is True
+    assert not scheduler.active
+    assert len(outbound.creates()) == 2
+
+
+def test_errors_about_other_events_leave_the_scheduler_alone():
+    outbound = RecordingOutbound()
+    scheduler = ResponseScheduler(outbound)
+
+    scheduler.request()
+    assert scheduler.on_error(None) is False
+    assert scheduler.on_error("event_something_else") is False
+    assert scheduler.active
+
+    # Once the response started, an error can no longer be about our create
+    create_event_id = outbound.creates()[0]["event_id"]
+    scheduler.on_response_created("resp_1")
+    assert scheduler.on_error(create_event_id) is False
+    assert scheduler.active
+
+
+def test_active_response_collision_retries_after_response_done():
+    outbound = RecordingOutbound()
+    scheduler = ResponseScheduler(outbound)
+
+    scheduler.request()
+    scheduler.on_active_response_error()
+    assert len(outbound.creates()) == 1
+
+    scheduler.on_response_done("resp_server")
+    assert len(outbound.creates()) == 2
+    assert scheduler.stats()["collisions"] == 1
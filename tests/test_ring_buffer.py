@@ -0,0 +1,38 @@
+import pytest
+
+from realtime.forge.modules.ring_buffer import AudioRingBuffer
+
+
+def test_read_across_the_wrap_point():
+    ring = AudioRingBuffer(capacity=8, frame_size=2)
+    ring.write(b"abcdef")
+    assert bytes(ring.read(4)) == b"abcd"
+    ring.write(b"ghij")
+
+    assert bytes(ring.read()) == b"efghij"
+    assert ring.read() is None
+
+
+def test_overwrite_discards_the_oldest_audio():
+    ring = AudioRingBuffer(capacity=6, frame_size=2)
+    for frame in (b"aa", b"bb", b"cc", b"dd"):
+        assert ring.write(frame)
+
+    assert bytes(ring.read()) == b"bbccdd"
+    assert ring.stats()["frames_overwritten"] == 1
+
+
+def test_drop_rejects_frames_until_the_reader_catches_up():
+    ring = AudioRingBuffer(capacity=4, frame_size=2, overflow_policy=AudioRingBuffer.DROP)
+    assert ring.write(b"aa")
+    assert ring.write(b"bb")
+    assert not ring.write(b"cc")
+
+    assert bytes(ring.read()) == b"aabb"
+    assert ring.write(b"dd")
+    assert ring.stats()["frames_dropped"] == 1
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        AudioRingBuffer(capacity=4, frame_size=2, overflow_policy="block")